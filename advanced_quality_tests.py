@@ -5,19 +5,37 @@ This script demonstrates advanced quality testing, alerting, and debugging capab
 """
 
 import os
+import sys
 import json
 from datetime import datetime
-from dotenv import load_dotenv
 
-from scraper.garage_grown_gear_scraper import GarageGrownGearScraper
-from data_processing.product_data_processor import ProductDataProcessor
 from data_processing.quality_monitor import DataQualityMonitor, DataQualityAlert
-from error_handling.logging_config import setup_logging
+
+# Shared fields for the synthetic products used by the harnesses below
+_PRODUCT_TEMPLATE = {'brand': 'Brand A', 'availability_status': 'Available'}
+
+# Per-run (name, price, brand) cutoffs for the historical trend runs:
+# product i keeps a field only while i is below that field's cutoff
+_TREND_RUN_CUTOFFS = (
+    (10, 10, 10),  # Run 1: High quality
+    (8, 9, 10),    # Run 2: Medium quality (some missing data)
+    (6, 7, 8),     # Run 3: Lower quality (more issues)
+    (9, 8, 10),    # Run 4: Improving quality
+    (10, 10, 10),  # Run 5: High quality again
+)
+
+_SEVERITY_EMOJI = {'low': '💙', 'medium': '🟡', 'high': '🟠', 'critical': '🔴'}
+
+def _emit(lines):
+    """Write a harness section's buffered output in one call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 def test_quality_alerting():
     """Test the quality alerting system with custom thresholds."""
-    print("\n🚨 TESTING QUALITY ALERTING SYSTEM")
-    print("-" * 40)
+    out = []
+    out.append("\n🚨 TESTING QUALITY ALERTING SYSTEM")
+    out.append("-" * 40)
     
     # Create a quality monitor with stricter thresholds
     strict_thresholds = {
@@ -32,70 +50,73 @@ def test_quality_alerting():
     monitor = DataQualityMonitor(alert_thresholds=strict_thresholds)
     
     # Test with sample data that should trigger alerts
+    good_product = dict(_PRODUCT_TEMPLATE, name='Product 1', current_price=100.0,
+                        product_url='https://example.com/1')
     test_products = [
         # Good products
-        {'name': 'Product 1', 'current_price': 100.0, 'brand': 'Brand A', 'product_url': 'https://example.com/1', 'availability_status': 'Available'},
-        {'name': 'Product 2', 'current_price': 200.0, 'brand': 'Brand B', 'product_url': 'https://example.com/2', 'availability_status': 'Available'},
-        {'name': 'Product 3', 'current_price': 300.0, 'brand': 'Brand A', 'product_url': 'https://example.com/3', 'availability_status': 'Available'},
+        good_product,
+        dict(_PRODUCT_TEMPLATE, name='Product 2', current_price=200.0, brand='Brand B',
+             product_url='https://example.com/2'),
+        dict(_PRODUCT_TEMPLATE, name='Product 3', current_price=300.0,
+             product_url='https://example.com/3'),
         
         # Products with issues to trigger alerts
         {'name': '', 'current_price': None, 'brand': '', 'product_url': '', 'availability_status': ''},  # Missing data
-        {'name': 'Product 5', 'current_price': -50.0, 'brand': 'Brand C', 'product_url': 'not-a-url', 'availability_status': 'Available'},  # Invalid data
-        {'name': 'Product 1', 'current_price': 100.0, 'brand': 'Brand A', 'product_url': 'https://example.com/1', 'availability_status': 'Available'},  # Duplicate
+        dict(_PRODUCT_TEMPLATE, name='Product 5', current_price=-50.0, brand='Brand C',
+             product_url='not-a-url'),  # Invalid data
+        dict(good_product),  # Duplicate
     ]
     
     # Analyze the test data
     metrics = monitor.analyze_data_quality(test_products)
     
-    print(f"📊 Quality Analysis Results:")
-    print(f"   Quality Score: {metrics.quality_score:.1f}/100")
-    print(f"   Completeness: {metrics.completeness_rate:.1f}%")
-    print(f"   Validity: {metrics.validity_rate:.1f}%")
-    print(f"   Total Products: {metrics.total_products}")
-    print(f"   Valid Products: {metrics.valid_products}")
-    print(f"   Duplicates: {metrics.duplicate_products}")
+    out.append(f"📊 Quality Analysis Results:")
+    out.append(f"   Quality Score: {metrics.quality_score:.1f}/100")
+    out.append(f"   Completeness: {metrics.completeness_rate:.1f}%")
+    out.append(f"   Validity: {metrics.validity_rate:.1f}%")
+    out.append(f"   Total Products: {metrics.total_products}")
+    out.append(f"   Valid Products: {metrics.valid_products}")
+    out.append(f"   Duplicates: {metrics.duplicate_products}")
     
     # Show alerts
     if monitor.alerts:
-        print(f"\n🚨 QUALITY ALERTS TRIGGERED ({len(monitor.alerts)}):")
+        out.append(f"\n🚨 QUALITY ALERTS TRIGGERED ({len(monitor.alerts)}):")
         for alert in monitor.alerts:
-            severity_emoji = {'low': '💙', 'medium': '🟡', 'high': '🟠', 'critical': '🔴'}
-            emoji = severity_emoji.get(alert.severity, '⚪')
-            print(f"   {emoji} [{alert.severity.upper()}] {alert.alert_type}: {alert.message}")
+            emoji = _SEVERITY_EMOJI.get(alert.severity, '⚪')
+            out.append(f"   {emoji} [{alert.severity.upper()}] {alert.alert_type}: {alert.message}")
     else:
-        print("\n✅ No alerts triggered")
+        out.append("\n✅ No alerts triggered")
     
+    _emit(out)
     return monitor, metrics
 
 def test_historical_trends():
     """Test historical trend analysis."""
-    print("\n📈 TESTING HISTORICAL TREND ANALYSIS")
-    print("-" * 35)
+    out = []
+    out.append("\n📈 TESTING HISTORICAL TREND ANALYSIS")
+    out.append("-" * 35)
     
     monitor = DataQualityMonitor()
     
     # Simulate multiple runs with different quality levels
     test_datasets = [
-        # Run 1: High quality
-        [{'name': f'Product {i}', 'current_price': 100.0 + i*10, 'brand': 'Brand A', 'product_url': f'https://example.com/{i}', 'availability_status': 'Available'} for i in range(10)],
-        
-        # Run 2: Medium quality (some missing data)
-        [{'name': f'Product {i}' if i < 8 else '', 'current_price': 100.0 + i*10 if i < 9 else None, 'brand': 'Brand A', 'product_url': f'https://example.com/{i}', 'availability_status': 'Available'} for i in range(10)],
-        
-        # Run 3: Lower quality (more issues)
-        [{'name': f'Product {i}' if i < 6 else '', 'current_price': 100.0 + i*10 if i < 7 else None, 'brand': 'Brand A' if i < 8 else '', 'product_url': f'https://example.com/{i}', 'availability_status': 'Available'} for i in range(10)],
-        
-        # Run 4: Improving quality
-        [{'name': f'Product {i}' if i < 9 else '', 'current_price': 100.0 + i*10 if i < 8 else None, 'brand': 'Brand A', 'product_url': f'https://example.com/{i}', 'availability_status': 'Available'} for i in range(10)],
-        
-        # Run 5: High quality again
-        [{'name': f'Product {i}', 'current_price': 100.0 + i*10, 'brand': 'Brand A', 'product_url': f'https://example.com/{i}', 'availability_status': 'Available'} for i in range(10)],
+        [
+            dict(
+                _PRODUCT_TEMPLATE,
+                name=f'Product {i}' if i < name_cutoff else '',
+                current_price=100.0 + i*10 if i < price_cutoff else None,
+                brand='Brand A' if i < brand_cutoff else '',
+                product_url=f'https://example.com/{i}',
+            )
+            for i in range(10)
+        ]
+        for name_cutoff, price_cutoff, brand_cutoff in _TREND_RUN_CUTOFFS
     ]
     
     # Process each dataset
     for i, dataset in enumerate(test_datasets, 1):
         metrics = monitor.analyze_data_quality(dataset)
-        print(f"Run {i}: Quality Score {metrics.quality_score:.1f}, Completeness {metrics.completeness_rate:.1f}%, Validity {metrics.validity_rate:.1f}%")
+        out.append(f"Run {i}: Quality Score {metrics.quality_score:.1f}, Completeness {metrics.completeness_rate:.1f}%, Validity {metrics.validity_rate:.1f}%")
     
     # Get comprehensive quality report with trends
     quality_report = monitor.get_quality_report(include_history=True)
@@ -103,23 +124,24 @@ def test_historical_trends():
     # Show trends
     trends = quality_report.get('historical_trends', {})
     if trends:
-        print(f"\n📊 Historical Trends:")
-        print(f"   Completeness Trend: {trends.get('completeness_trend', 'N/A')}")
-        print(f"   Validity Trend: {trends.get('validity_trend', 'N/A')}")
-        print(f"   Quality Trend: {trends.get('quality_trend', 'N/A')}")
-        print(f"   Average Quality Score: {trends.get('avg_quality_score', 0):.1f}")
+        out.append(f"\n📊 Historical Trends:")
+        out.append(f"   Completeness Trend: {trends.get('completeness_trend', 'N/A')}")
+        out.append(f"   Validity Trend: {trends.get('validity_trend', 'N/A')}")
+        out.append(f"   Quality Trend: {trends.get('quality_trend', 'N/A')}")
+        out.append(f"   Average Quality Score: {trends.get('avg_quality_score', 0):.1f}")
     
     # Show quality assessment
     quality_trend = quality_report.get('quality_trend', {})
     if quality_trend:
-        print(f"\n🎯 Quality Assessment:")
-        print(f"   Overall Assessment: {quality_trend.get('assessment', 'unknown').upper()}")
-        print(f"   Trend Direction: {quality_trend.get('trend', 'unknown').upper()}")
-        print(f"   Current Score: {quality_trend.get('current_score', 0):.1f}")
+        out.append(f"\n🎯 Quality Assessment:")
+        out.append(f"   Overall Assessment: {quality_trend.get('assessment', 'unknown').upper()}")
+        out.append(f"   Trend Direction: {quality_trend.get('trend', 'unknown').upper()}")
+        out.append(f"   Current Score: {quality_trend.get('current_score', 0):.1f}")
         recommendation = quality_trend.get('recommendation', '')
         if recommendation:
-            print(f"   💡 Recommendation: {recommendation}")
+            out.append(f"   💡 Recommendation: {recommendation}")
     
+    _emit(out)
     return monitor
 
 def test_debug_mode():
@@ -127,6 +149,8 @@ def test_debug_mode():
     print("\n🐛 TESTING DEBUG MODE")
     print("-" * 20)
     
+    from error_handling.logging_config import setup_logging
+    
     # Set up debug logging
     logger = setup_logging(level="DEBUG", console=True, structured=False)
     
@@ -145,10 +169,15 @@ def test_debug_mode():
 
 def test_custom_validation():
     """Test custom validation rules."""
-    print("\n🔧 TESTING CUSTOM VALIDATION")
-    print("-" * 28)
+    out = []
+    out.append("\n🔧 TESTING CUSTOM VALIDATION")
+    out.append("-" * 28)
     
-    processor = ProductDataProcessor(enable_quality_monitoring=True)
+    from data_processing.product_data_processor import ProductDataProcessor
+    
+    # Only pass/fail is reported here, so skip quality and performance tracking
+    processor = ProductDataProcessor(enable_performance_monitoring=False,
+                                     enable_quality_monitoring=False)
     
     # Test with various edge cases
     test_cases = [
@@ -169,22 +198,30 @@ def test_custom_validation():
         {'name': 'Missing URL Product', 'current_price': 50.00, 'brand': 'Test Brand', 'product_url': '', 'availability_status': 'Available'},
     ]
     
-    print("Testing validation rules:")
+    out.append("Testing validation rules:")
+    try:
+        # Validate the whole batch in one call; each test case has a unique URL
+        processed = processor.process_products(test_cases)
+    except Exception as e:
+        out.append(f"   💥 ERROR - {str(e)}")
+        _emit(out)
+        return
+
+    passed_urls = {product.product_url for product in processed}
     for i, test_case in enumerate(test_cases, 1):
-        try:
-            processed = processor.process_products([test_case])
-            if processed:
-                print(f"   ✅ Test {i}: PASSED - {test_case.get('name', 'Unnamed')} (${test_case.get('current_price', 'N/A')})")
-            else:
-                print(f"   ❌ Test {i}: FAILED - {test_case.get('name', 'Unnamed')} (${test_case.get('current_price', 'N/A')})")
-        except Exception as e:
-            print(f"   💥 Test {i}: ERROR - {str(e)}")
+        if test_case.get('product_url') in passed_urls:
+            out.append(f"   ✅ Test {i}: PASSED - {test_case.get('name', 'Unnamed')} (${test_case.get('current_price', 'N/A')})")
+        else:
+            out.append(f"   ❌ Test {i}: FAILED - {test_case.get('name', 'Unnamed')} (${test_case.get('current_price', 'N/A')})")
+    
+    _emit(out)
 
 def main():
     print("🔬 ADVANCED DATA QUALITY TESTING SUITE")
     print("=" * 45)
     
     # Load environment
+    from dotenv import load_dotenv
     load_dotenv()
     
     # Test 1: Quality Alerting System
@@ -4,14 +4,50 @@ Provides dataclasses for different configuration sections with validation.
 """
 
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Mapping
 import os
-import re
+import string
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+# Deletes every character allowed in a spreadsheet ID, so a valid ID
+# translates to the empty string
+_SHEET_ID_STRIP_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-_')
+
+_URL_PREFIXES = ('http://', 'https://')
+_LOG_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_VALID_LOG_LEVELS = frozenset(_LOG_LEVEL_NAMES)
+
+_TRUTHY_VALUES = frozenset({"true", "1", "yes"})
+
+
+def is_valid_spreadsheet_id(spreadsheet_id: str) -> bool:
+    """Check that a spreadsheet ID is 44 ASCII letters, digits, '-' or '_'."""
+    return (len(spreadsheet_id) == 44
+            and not spreadsheet_id.translate(_SHEET_ID_STRIP_TABLE))
+
+
+def _env_bool(env: Mapping[str, str], name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment, falling back to default when unset."""
+    value = env.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in _TRUTHY_VALUES
+
+
+def _env_int(env: Mapping[str, str], name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to default when unset."""
+    value = env.get(name)
+    return default if value is None else int(value)
+
+
+def _env_float(env: Mapping[str, str], name: str, default: float) -> float:
+    """Read a float from the environment, falling back to default when unset."""
+    value = env.get(name)
+    return default if value is None else float(value)
+
 
 class ConfigurationError(Exception):
     """Raised when configuration validation fails."""
@@ -34,38 +70,40 @@ class ScraperConfig:
     
     def validate(self) -> None:
         """Validate scraper configuration."""
-        errors = []
-        
+        errors: List[str] = []
+        self._collect_errors(errors)
+        if errors:
+            raise ConfigurationError(f"Scraper configuration errors: {'; '.join(errors)}")
+    
+    def _collect_errors(self, errors: List[str], prefix: str = "") -> None:
+        """Append scraper configuration errors to errors, each prefixed with prefix."""
         if not self.base_url or not self.base_url.strip():
-            errors.append("Base URL is required")
-        elif not self.base_url.startswith(('http://', 'https://')):
-            errors.append("Base URL must start with http:// or https://")
+            errors.append(f"{prefix}Base URL is required")
+        elif not self.base_url.startswith(_URL_PREFIXES):
+            errors.append(f"{prefix}Base URL must start with http:// or https://")
         
         if self.max_retries < 0:
-            errors.append("Max retries must be non-negative")
+            errors.append(f"{prefix}Max retries must be non-negative")
         elif self.max_retries > 10:
-            errors.append("Max retries should not exceed 10 for reasonable performance")
+            errors.append(f"{prefix}Max retries should not exceed 10 for reasonable performance")
         
         if self.retry_delay < 0:
-            errors.append("Retry delay must be non-negative")
+            errors.append(f"{prefix}Retry delay must be non-negative")
         elif self.retry_delay > 60:
-            errors.append("Retry delay should not exceed 60 seconds")
+            errors.append(f"{prefix}Retry delay should not exceed 60 seconds")
         
         if self.request_timeout <= 0:
-            errors.append("Request timeout must be positive")
+            errors.append(f"{prefix}Request timeout must be positive")
         elif self.request_timeout > 300:
-            errors.append("Request timeout should not exceed 300 seconds")
+            errors.append(f"{prefix}Request timeout should not exceed 300 seconds")
         
         if self.delay_between_requests < 0:
-            errors.append("Delay between requests must be non-negative")
+            errors.append(f"{prefix}Delay between requests must be non-negative")
         elif self.delay_between_requests > 10:
-            errors.append("Delay between requests should not exceed 10 seconds for reasonable performance")
+            errors.append(f"{prefix}Delay between requests should not exceed 10 seconds for reasonable performance")
         
         if not self.user_agent or not self.user_agent.strip():
-            errors.append("User agent is required")
-        
-        if errors:
-            raise ConfigurationError(f"Scraper configuration errors: {'; '.join(errors)}")
+            errors.append(f"{prefix}User agent is required")
 
 
 @dataclass
@@ -84,21 +122,23 @@ class SheetsConfig:
     
     def validate(self) -> None:
         """Validate Google Sheets configuration."""
-        errors = []
-        
+        errors: List[str] = []
+        self._collect_errors(errors)
+        if errors:
+            raise ConfigurationError(f"Google Sheets configuration errors: {'; '.join(errors)}")
+    
+    def _collect_errors(self, errors: List[str], prefix: str = "") -> None:
+        """Append sheets configuration errors to errors, each prefixed with prefix."""
         if not self.spreadsheet_id:
-            errors.append("SPREADSHEET_ID is required but not provided")
-        elif not re.match(r'^[a-zA-Z0-9-_]{44}$', self.spreadsheet_id):
-            errors.append("SPREADSHEET_ID format appears invalid (should be 44 characters)")
+            errors.append(f"{prefix}SPREADSHEET_ID is required but not provided")
+        elif not is_valid_spreadsheet_id(self.spreadsheet_id):
+            errors.append(f"{prefix}SPREADSHEET_ID format appears invalid (should be 44 characters)")
         
         if not self.sheet_name or not self.sheet_name.strip():
-            errors.append("Sheet name cannot be empty")
+            errors.append(f"{prefix}Sheet name cannot be empty")
         
         if not self.credentials_file:
-            errors.append("Credentials file path is required")
-        
-        if errors:
-            raise ConfigurationError(f"Google Sheets configuration errors: {'; '.join(errors)}")
+            errors.append(f"{prefix}Credentials file path is required")
 
 
 @dataclass
@@ -111,23 +151,26 @@ class LoggingConfig:
     
     def __post_init__(self):
         self.validate()
+        # Store the canonical upper-case name so consumers need not normalize it
+        self.level = self.level.upper()
     
     def validate(self) -> None:
         """Validate logging configuration."""
-        errors = []
-        
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.level.upper() not in valid_levels:
-            errors.append(f"Log level must be one of: {', '.join(valid_levels)}")
+        errors: List[str] = []
+        self._collect_errors(errors)
+        if errors:
+            raise ConfigurationError(f"Logging configuration errors: {'; '.join(errors)}")
+    
+    def _collect_errors(self, errors: List[str], prefix: str = "") -> None:
+        """Append logging configuration errors to errors, each prefixed with prefix."""
+        if self.level.upper() not in _VALID_LOG_LEVELS:
+            errors.append(f"{prefix}Log level must be one of: {', '.join(_LOG_LEVEL_NAMES)}")
         
         if not self.format or not self.format.strip():
-            errors.append("Log format cannot be empty")
+            errors.append(f"{prefix}Log format cannot be empty")
         
         if self.log_to_file and (not self.log_file_path or not self.log_file_path.strip()):
-            errors.append("Log file path is required when log_to_file is True")
-        
-        if errors:
-            raise ConfigurationError(f"Logging configuration errors: {'; '.join(errors)}")
+            errors.append(f"{prefix}Log file path is required when log_to_file is True")
 
 
 @dataclass
@@ -147,19 +190,21 @@ class NotificationConfig:
     
     def validate(self) -> None:
         """Validate notification configuration."""
-        errors = []
-        
+        errors: List[str] = []
+        self._collect_errors(errors)
+        if errors:
+            raise ConfigurationError(f"Notification configuration errors: {'; '.join(errors)}")
+    
+    def _collect_errors(self, errors: List[str], prefix: str = "") -> None:
+        """Append notification configuration errors to errors, each prefixed with prefix."""
         if self.enable_notifications and not self.webhook_url and not self.email_notifications:
-            errors.append("When notifications are enabled, either webhook_url or email_notifications must be configured")
+            errors.append(f"{prefix}When notifications are enabled, either webhook_url or email_notifications must be configured")
         
-        if self.webhook_url and not self.webhook_url.startswith(('http://', 'https://')):
-            errors.append("Webhook URL must start with http:// or https://")
+        if self.webhook_url and not self.webhook_url.startswith(_URL_PREFIXES):
+            errors.append(f"{prefix}Webhook URL must start with http:// or https://")
         
         if self.price_drop_threshold < 0 or self.price_drop_threshold > 100:
-            errors.append("Price drop threshold must be between 0 and 100 percent")
-        
-        if errors:
-            raise ConfigurationError(f"Notification configuration errors: {'; '.join(errors)}")
+            errors.append(f"{prefix}Price drop threshold must be between 0 and 100 percent")
 
 
 @dataclass
@@ -183,42 +228,44 @@ class AppConfig:
     @classmethod
     def from_env(cls) -> 'AppConfig':
         """Create configuration from environment variables."""
+        env = os.environ
+        
         try:
             scraper_config = ScraperConfig(
-                base_url=os.getenv("BASE_URL", ScraperConfig.base_url),
-                max_retries=int(os.getenv("MAX_RETRIES", ScraperConfig.max_retries)),
-                retry_delay=float(os.getenv("RETRY_DELAY", ScraperConfig.retry_delay)),
-                request_timeout=int(os.getenv("REQUEST_TIMEOUT", ScraperConfig.request_timeout)),
-                use_stealth_mode=os.getenv("USE_STEALTH_MODE", "true").lower() == "true",
-                delay_between_requests=float(os.getenv("DELAY_BETWEEN_REQUESTS", ScraperConfig.delay_between_requests))
+                base_url=env.get("BASE_URL", ScraperConfig.base_url),
+                max_retries=_env_int(env, "MAX_RETRIES", ScraperConfig.max_retries),
+                retry_delay=_env_float(env, "RETRY_DELAY", ScraperConfig.retry_delay),
+                request_timeout=_env_int(env, "REQUEST_TIMEOUT", ScraperConfig.request_timeout),
+                use_stealth_mode=_env_bool(env, "USE_STEALTH_MODE", True),
+                delay_between_requests=_env_float(env, "DELAY_BETWEEN_REQUESTS", ScraperConfig.delay_between_requests)
             )
         except (ValueError, TypeError) as e:
             raise ConfigurationError(f"Error parsing scraper configuration from environment: {e}")
         
         try:
             sheets_config = SheetsConfig(
-                spreadsheet_id=os.getenv("SPREADSHEET_ID", ""),
-                sheet_name=os.getenv("SHEET_NAME", SheetsConfig.sheet_name),
-                credentials_file=os.getenv("CREDENTIALS_FILE", SheetsConfig.credentials_file)
+                spreadsheet_id=env.get("SPREADSHEET_ID", ""),
+                sheet_name=env.get("SHEET_NAME", SheetsConfig.sheet_name),
+                credentials_file=env.get("CREDENTIALS_FILE", SheetsConfig.credentials_file)
             )
         except (ValueError, TypeError) as e:
             raise ConfigurationError(f"Error parsing sheets configuration from environment: {e}")
         
         try:
             logging_config = LoggingConfig(
-                level=os.getenv("LOG_LEVEL", LoggingConfig.level),
-                log_to_file=os.getenv("LOG_TO_FILE", "false").lower() == "true",
-                log_file_path=os.getenv("LOG_FILE_PATH", LoggingConfig.log_file_path)
+                level=env.get("LOG_LEVEL", LoggingConfig.level),
+                log_to_file=_env_bool(env, "LOG_TO_FILE", False),
+                log_file_path=env.get("LOG_FILE_PATH", LoggingConfig.log_file_path)
             )
         except (ValueError, TypeError) as e:
             raise ConfigurationError(f"Error parsing logging configuration from environment: {e}")
         
         try:
             notifications_config = NotificationConfig(
-                enable_notifications=os.getenv("ENABLE_NOTIFICATIONS", "false").lower() == "true",
-                webhook_url=os.getenv("WEBHOOK_URL"),
-                email_notifications=os.getenv("EMAIL_NOTIFICATIONS", "false").lower() == "true",
-                price_drop_threshold=float(os.getenv("PRICE_DROP_THRESHOLD", NotificationConfig.price_drop_threshold))
+                enable_notifications=_env_bool(env, "ENABLE_NOTIFICATIONS", False),
+                webhook_url=env.get("WEBHOOK_URL"),
+                email_notifications=_env_bool(env, "EMAIL_NOTIFICATIONS", False),
+                price_drop_threshold=_env_float(env, "PRICE_DROP_THRESHOLD", NotificationConfig.price_drop_threshold)
             )
         except (ValueError, TypeError) as e:
             raise ConfigurationError(f"Error parsing notification configuration from environment: {e}")
@@ -232,18 +279,12 @@ class AppConfig:
     
     def validate_all(self) -> List[str]:
         """Validate all configuration sections and return list of errors."""
-        errors = []
+        errors: List[str] = []
         
-        for config_name, config_obj in [
-            ("scraper", self.scraper),
-            ("sheets", self.sheets), 
-            ("logging", self.logging),
-            ("notifications", self.notifications)
-        ]:
-            try:
-                config_obj.validate()
-            except ConfigurationError as e:
-                errors.append(f"{config_name}: {e}")
+        self.scraper._collect_errors(errors, "scraper: ")
+        self.sheets._collect_errors(errors, "sheets: ")
+        self.logging._collect_errors(errors, "logging: ")
+        self.notifications._collect_errors(errors, "notifications: ")
         
         return errors
 
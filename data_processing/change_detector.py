@@ -9,14 +9,65 @@ import json
 import os
 from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import cached_property, partial
 from pathlib import Path
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
 from .product_data_processor import Product
 
+# History fields whose change means an entry must be written again
+_TRACKED_FIELDS = (
+    'name', 'brand', 'current_price', 'original_price', 'discount_percentage',
+    'availability_status', 'rating', 'reviews_count', 'sale_label',
+)
+
+# An unchanged entry's stored last_seen is refreshed at most this often, so
+# age-based cleanup stays accurate to within a day without rewriting every
+# product on every run
+_LAST_SEEN_REFRESH_SECONDS = 24 * 60 * 60
+
+# Priorities that make a price drop or restock a priority deal
+_HIGH_PRIORITY = frozenset(('high', 'critical'))
+
+# Availability statuses produced by ProductDataProcessor._normalize_availability_status
+_AVAILABILITY_STATUSES = ('Available', 'Limited', 'Sold out', 'Unknown')
+
+# (old status, new status) -> (change type, priority); any other change
+# between two different statuses is a low priority 'availability_change'
+_AVAILABILITY_TRANSITIONS = {
+    **{('Sold out', status): ('back_in_stock', 'high')
+       for status in _AVAILABILITY_STATUSES if status != 'Sold out'},
+    **{(status, 'Sold out'): ('sold_out', 'normal')
+       for status in _AVAILABILITY_STATUSES if status != 'Sold out'},
+}
+
+# Fixed opening lines of every notification message
+_MESSAGE_HEADER = (
+    "🛍️ Garage Grown Gear Sale Update - {timestamp}\n"
+    "\n"
+    "📊 Summary:\n"
+    "• Total products monitored: {total_products}"
+)
 
-@dataclass
+# Priority deal lines in notification messages, keyed by change type
+_DEAL_TEMPLATES = {
+    'price_drop': "• 💸 {name}: ${old:.2f} → ${new:.2f} (-{pct:.1f}%)",
+    'back_in_stock': "• 🔄 {name}: Back in stock!",
+}
+
+
+@dataclass(slots=True)
 class ProductChange:
     """Represents a change detected in a product."""
     product_url: str
@@ -34,10 +85,20 @@ class ProductChange:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        # Built by hand: every field is flat, so asdict()'s recursive deep copy is wasted work
+        return {
+            'product_url': self.product_url,
+            'product_name': self.product_name,
+            'change_type': self.change_type,
+            'old_value': self.old_value,
+            'new_value': self.new_value,
+            'change_percentage': self.change_percentage,
+            'timestamp': self.timestamp,
+            'priority': self.priority,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationSummary:
     """Summary of changes for notification purposes."""
     timestamp: str
@@ -55,33 +116,106 @@ class NotificationSummary:
 
 
 class ProductHistoryManager:
-    """Manages historical product data for change detection."""
+    """Manages historical product data for change detection.
+
+    The canonical history lives in a JSON file. Updates between compactions
+    are appended to a JSON-lines journal next to it, so each save only
+    writes the products whose tracked fields changed since the previous
+    save, plus entries whose stored last_seen is due for a refresh.
+    """
     
     def __init__(self, history_file: str = "product_history.json"):
         self.history_file = Path(history_file)
-        self.history = self._load_history()
+        self.journal_file = self.history_file.with_suffix('.jsonl')
         self.logger = logging.getLogger(__name__)
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._journal_records = 0
+    
+    @cached_property
+    def history(self) -> Dict[str, Dict[str, Any]]:
+        """Product history keyed by URL, loaded from disk on first access."""
+        return self._load_history()
     
     def _load_history(self) -> Dict[str, Dict[str, Any]]:
-        """Load product history from file."""
-        if not self.history_file.exists():
-            return {}
-        
+        """Load product history from file and replay the journal on top."""
+        history = {}
+        if self.history_file.exists():
+            try:
+                if orjson is not None:
+                    history = orjson.loads(self.history_file.read_bytes())
+                else:
+                    with open(self.history_file, 'r', encoding='utf-8') as f:
+                        history = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logging.warning(f"Failed to load history file: {e}")
+                history = {}
+        
+        if self.journal_file.exists():
+            self._replay_journal(history)
+        
+        return history
+    
+    def _replay_journal(self, history: Dict[str, Dict[str, Any]]) -> None:
+        """Apply journaled product records to the loaded history in order."""
+        loads = orjson.loads if orjson is not None else json.loads
         try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logging.warning(f"Failed to load history file: {e}")
-            return {}
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = loads(line)
+                        history[record['url']] = record['data']
+                    except (ValueError, KeyError, TypeError):
+                        # A partially written trailing line from an interrupted run
+                        self.logger.warning("Skipping malformed history journal record")
+                        continue
+                    self._journal_records += 1
+        except IOError as e:
+            logging.warning(f"Failed to read history journal: {e}")
     
     def _save_history(self) -> None:
-        """Save product history to file."""
+        """Append records for products updated since the last save to the journal."""
+        if not self._dirty:
+            return
+        
+        try:
+            # Ensure directory exists
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            if orjson is not None:
+                lines = [orjson.dumps({'url': url, 'data': data}) for url, data in self._dirty.items()]
+            else:
+                lines = [
+                    json.dumps({'url': url, 'data': data}, ensure_ascii=False).encode('utf-8')
+                    for url, data in self._dirty.items()
+                ]
+            with open(self.journal_file, 'ab') as f:
+                f.write(b'\n'.join(lines) + b'\n')
+            
+            self._journal_records += len(lines)
+            self._dirty.clear()
+        except IOError as e:
+            logging.error(f"Failed to save history file: {e}")
+    
+    def compact(self) -> None:
+        """Rewrite the full history file and discard the journal."""
         try:
             # Ensure directory exists
             self.history_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                self.history_file.write_bytes(
+                    orjson.dumps(self.history, option=orjson.OPT_INDENT_2)
+                )
+            else:
+                with open(self.history_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.history, f, indent=2, ensure_ascii=False)
+            
+            # The base file now holds every journaled update
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_records = 0
+            self._dirty.clear()
         except IOError as e:
             logging.error(f"Failed to save history file: {e}")
     
@@ -90,7 +224,20 @@ class ProductHistoryManager:
         return self.history.get(product_url)
     
     def update_product_history(self, product: Product) -> None:
-        """Update historical data for a product."""
+        """
+        Update historical data for a product.
+        
+        Entries are left as they are when no tracked field changed and their
+        last_seen is recent, so they are not journaled again on the next save.
+        """
+        previous = self.history.get(product.product_url)
+        if previous is not None:
+            seen = self._last_seen_ts(previous)
+            if (seen is not None
+                    and product.timestamp.timestamp() - seen < _LAST_SEEN_REFRESH_SECONDS
+                    and all(previous.get(key) == getattr(product, key) for key in _TRACKED_FIELDS)):
+                return
+        
         product_data = {
             'name': product.name,
             'brand': product.brand,
@@ -101,34 +248,49 @@ class ProductHistoryManager:
             'rating': product.rating,
             'reviews_count': product.reviews_count,
             'last_seen': product.timestamp.isoformat(),
+            'last_seen_ts': product.timestamp.timestamp(),
             'sale_label': product.sale_label
         }
         
         self.history[product.product_url] = product_data
+        self._dirty[product.product_url] = product_data
     
     def save_current_state(self) -> None:
         """Save current state to file."""
         self._save_history()
     
+    @staticmethod
+    def _last_seen_ts(data: Dict[str, Any]) -> Optional[float]:
+        """Return when a history entry was last seen, or None if it has no valid date."""
+        last_seen_ts = data.get('last_seen_ts')
+        if last_seen_ts is None:
+            # Entries written before last_seen_ts was recorded
+            try:
+                last_seen_ts = datetime.fromisoformat(data.get('last_seen', '')).timestamp()
+            except (ValueError, TypeError):
+                return None
+        return last_seen_ts
+    
     def cleanup_old_entries(self, days_to_keep: int = 30) -> None:
         """Remove entries older than specified days."""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff_ts = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
+        last_seen_ts = self._last_seen_ts
         
-        urls_to_remove = []
-        for url, data in self.history.items():
-            try:
-                last_seen = datetime.fromisoformat(data.get('last_seen', ''))
-                if last_seen < cutoff_date:
-                    urls_to_remove.append(url)
-            except (ValueError, TypeError):
-                # Remove entries with invalid dates
-                urls_to_remove.append(url)
+        # Rebuild rather than delete in place; entries with invalid dates are dropped
+        kept = {
+            url: data for url, data in self.history.items()
+            if (seen := last_seen_ts(data)) is not None and seen >= cutoff_ts
+        }
+        removed = len(self.history) - len(kept)
+        self.history = kept
         
-        for url in urls_to_remove:
-            del self.history[url]
+        if removed:
+            self.logger.info(f"Cleaned up {removed} old history entries")
         
-        if urls_to_remove:
-            self.logger.info(f"Cleaned up {len(urls_to_remove)} old history entries")
+        # Removals can only be persisted by compacting; otherwise compact once
+        # the journal has grown past the size of the history itself
+        if removed or self._journal_records > len(self.history):
+            self.compact()
 
 
 class ChangeDetector:
@@ -152,26 +314,39 @@ class ChangeDetector:
         changes = []
         current_urls = {product.product_url for product in current_products}
         
+        # All changes from one batch share a timestamp
+        timestamp = datetime.now().isoformat()
+        
+        # Resolve these once rather than on every iteration
+        history = self.history_manager.history
+        append = changes.append
+        update_history = self.history_manager.update_product_history
+        
         for product in current_products:
-            historical_data = self.history_manager.get_product_history(product.product_url)
+            historical_data = history.get(product.product_url)
             
             if historical_data is None:
                 # New product
-                changes.append(ProductChange(
+                append(ProductChange(
                     product_url=product.product_url,
                     product_name=product.name,
                     change_type='new_product',
                     old_value=None,
                     new_value=product.current_price,
+                    timestamp=timestamp,
                     priority='normal'
                 ))
-            else:
-                # Check for changes in existing product
-                product_changes = self._detect_product_changes(product, historical_data)
+            elif (
+                historical_data.get('current_price') != product.current_price or
+                historical_data.get('availability_status') != product.availability_status
+            ):
+                # Check for changes in existing product; most products are
+                # unchanged between runs and skip this entirely
+                product_changes = self._detect_product_changes(product, historical_data, timestamp)
                 changes.extend(product_changes)
             
             # Update history with current data
-            self.history_manager.update_product_history(product)
+            update_history(product)
         
         # Save updated history
         self.history_manager.save_current_state()
@@ -179,9 +354,21 @@ class ChangeDetector:
         self.logger.info(f"Detected {len(changes)} changes across {len(current_products)} products")
         return changes
     
-    def _detect_product_changes(self, current: Product, historical: Dict[str, Any]) -> List[ProductChange]:
+    def _detect_product_changes(
+        self,
+        current: Product,
+        historical: Dict[str, Any],
+        timestamp: Optional[str] = None
+    ) -> List[ProductChange]:
         """Detect changes in a single product."""
         changes = []
+        # Every change for this product shares these fields
+        make_change = partial(
+            ProductChange,
+            product_url=current.product_url,
+            product_name=current.name,
+            timestamp=timestamp
+        )
         
         # Price changes
         old_price = historical.get('current_price')
@@ -191,9 +378,7 @@ class ChangeDetector:
             if current.current_price < old_price:
                 # Price drop
                 priority = 'high' if abs(price_change_pct) >= self.price_drop_threshold else 'normal'
-                changes.append(ProductChange(
-                    product_url=current.product_url,
-                    product_name=current.name,
+                changes.append(make_change(
                     change_type='price_drop',
                     old_value=old_price,
                     new_value=current.current_price,
@@ -202,9 +387,7 @@ class ChangeDetector:
                 ))
             else:
                 # Price increase
-                changes.append(ProductChange(
-                    product_url=current.product_url,
-                    product_name=current.name,
+                changes.append(make_change(
                     change_type='price_increase',
                     old_value=old_price,
                     new_value=current.current_price,
@@ -215,52 +398,41 @@ class ChangeDetector:
         # Availability changes
         old_availability = historical.get('availability_status')
         if old_availability and old_availability != current.availability_status:
-            if current.availability_status == 'Sold out' and old_availability != 'Sold out':
-                changes.append(ProductChange(
-                    product_url=current.product_url,
-                    product_name=current.name,
-                    change_type='sold_out',
-                    old_value=old_availability,
-                    new_value=current.availability_status,
-                    priority='normal'
-                ))
-            elif old_availability == 'Sold out' and current.availability_status != 'Sold out':
-                changes.append(ProductChange(
-                    product_url=current.product_url,
-                    product_name=current.name,
-                    change_type='back_in_stock',
-                    old_value=old_availability,
-                    new_value=current.availability_status,
-                    priority='high'
-                ))
-            else:
-                changes.append(ProductChange(
-                    product_url=current.product_url,
-                    product_name=current.name,
-                    change_type='availability_change',
-                    old_value=old_availability,
-                    new_value=current.availability_status,
-                    priority='low'
-                ))
+            change_type, priority = _AVAILABILITY_TRANSITIONS.get(
+                (old_availability, current.availability_status),
+                ('availability_change', 'low')
+            )
+            changes.append(make_change(
+                change_type=change_type,
+                old_value=old_availability,
+                new_value=current.availability_status,
+                priority=priority
+            ))
         
         return changes
     
     def generate_summary(self, changes: List[ProductChange], total_products: int) -> NotificationSummary:
         """Generate a summary of changes for notifications."""
-        new_products = len([c for c in changes if c.change_type == 'new_product'])
-        price_drops = len([c for c in changes if c.change_type == 'price_drop'])
-        significant_price_drops = len([
-            c for c in changes 
-            if c.change_type == 'price_drop' and c.priority in ['high', 'critical']
-        ])
-        sold_out = len([c for c in changes if c.change_type == 'sold_out'])
-        back_in_stock = len([c for c in changes if c.change_type == 'back_in_stock'])
-        
+        new_products = price_drops = significant_price_drops = sold_out = back_in_stock = 0
         # Priority deals (high priority price drops and back in stock)
-        priority_deals = [
-            c for c in changes 
-            if c.priority in ['high', 'critical'] and c.change_type in ['price_drop', 'back_in_stock']
-        ]
+        priority_deals = []
+        
+        # Tally everything in a single pass over the changes
+        for c in changes:
+            change_type = c.change_type
+            if change_type == 'new_product':
+                new_products += 1
+            elif change_type == 'price_drop':
+                price_drops += 1
+                if c.priority in _HIGH_PRIORITY:
+                    significant_price_drops += 1
+                    priority_deals.append(c)
+            elif change_type == 'sold_out':
+                sold_out += 1
+            elif change_type == 'back_in_stock':
+                back_in_stock += 1
+                if c.priority in _HIGH_PRIORITY:
+                    priority_deals.append(c)
         
         return NotificationSummary(
             timestamp=datetime.now().isoformat(),
@@ -282,6 +454,8 @@ class NotificationManager:
         self.enable_notifications = enable_notifications
         self.price_drop_threshold = price_drop_threshold
         self.logger = logging.getLogger(__name__)
+        # Created on first webhook send and reused so connections stay alive
+        self._session = None
     
     def should_send_notification(self, summary: NotificationSummary) -> bool:
         """Determine if a notification should be sent based on the summary."""
@@ -299,10 +473,10 @@ class NotificationManager:
     def create_notification_message(self, summary: NotificationSummary) -> str:
         """Create a formatted notification message."""
         message_parts = [
-            f"🛍️ Garage Grown Gear Sale Update - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            "",
-            f"📊 Summary:",
-            f"• Total products monitored: {summary.total_products}",
+            _MESSAGE_HEADER.format(
+                timestamp=datetime.now().strftime('%Y-%m-%d %H:%M'),
+                total_products=summary.total_products
+            )
         ]
         
         if summary.new_products > 0:
@@ -323,14 +497,16 @@ class NotificationManager:
         # Add priority deals
         if summary.priority_deals:
             message_parts.extend(["", "🎯 Priority Deals:"])
-            for deal in summary.priority_deals[:5]:  # Limit to top 5
-                if deal.change_type == 'price_drop':
-                    message_parts.append(
-                        f"• 💸 {deal.product_name}: ${deal.old_value:.2f} → ${deal.new_value:.2f} "
-                        f"(-{deal.change_percentage:.1f}%)"
-                    )
-                elif deal.change_type == 'back_in_stock':
-                    message_parts.append(f"• 🔄 {deal.product_name}: Back in stock!")
+            message_parts.extend(
+                _DEAL_TEMPLATES[deal.change_type].format_map({
+                    'name': deal.product_name,
+                    'old': deal.old_value,
+                    'new': deal.new_value,
+                    'pct': deal.change_percentage,
+                })
+                for deal in summary.priority_deals[:5]  # Limit to top 5
+                if deal.change_type in _DEAL_TEMPLATES
+            )
         
         return "\n".join(message_parts)
     
@@ -353,8 +529,13 @@ class NotificationManager:
     
     def _send_webhook_notification(self, message: str) -> bool:
         """Send notification via webhook."""
+        if requests is None:
+            self.logger.error("Failed to send webhook notification: requests is not installed")
+            return False
+        
         try:
-            import requests
+            if self._session is None:
+                self._session = requests.Session()
             
             payload = {
                 'text': message,
@@ -362,7 +543,7 @@ class NotificationManager:
                 'icon_emoji': ':shopping_bags:'
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.webhook_url,
                 json=payload,
                 timeout=10
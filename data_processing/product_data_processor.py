@@ -6,21 +6,77 @@ scraped product data from the Garage Grown Gear website.
 """
 
 import re
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import string
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
-from .validators import ProductValidator, ErrorHandler, DataSanitizer
-from .quality_monitor import DataQualityMonitor, DataQualityMetrics
+from .validators import (
+    ProductValidator, ErrorHandler, DataSanitizer, is_clean_text, is_valid_url
+)
 from error_handling.monitoring import BatchProcessor, PerformanceMonitor
 
+if TYPE_CHECKING:
+    from .quality_monitor import DataQualityMetrics
+
 logger = logging.getLogger(__name__)
 
+# Every character str.isspace() accepts, i.e. what \s matches in a str regex
+_UNICODE_WHITESPACE = (
+    string.whitespace + '\x1c\x1d\x1e\x1f\x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+
+# Deletes currency symbols, thousands separators and whitespace from price strings
+_PRICE_STRIP_TABLE = str.maketrans('', '', '$,' + _UNICODE_WHITESPACE)
+
+# First run of digits in strings like "123 reviews" or "(45)"
+_DIGITS_RE = re.compile(r'\d+')
+
+# Text fields cleaned by clean_product_data: (field, max length, empty allowed)
+_TEXT_FIELDS = (
+    ('name', 200, False),
+    ('brand', 100, True),
+    ('sale_label', 50, True),
+)
+
+# Availability phrases mapped to standard statuses, in match priority order
+_AVAILABILITY_PHRASES = {
+    'sold out': "Sold out",
+    'out of stock': "Sold out",
+    'limited': "Limited",
+    'few left': "Limited",
+    'available': "Available",
+    'in stock': "Available",
+}
+
+# Product and image URLs on the store itself; relative URLs are resolved against it
+_SITE_ORIGIN = 'https://www.garagegrowngear.com'
+
+
+@lru_cache(maxsize=32)
+def _format_timestamp(timestamp: datetime, utc_offset: Optional[timedelta]) -> str:
+    """Format a timestamp; utc_offset is only part of the cache key."""
+    return timestamp.isoformat()
+
+
+def _isoformat(timestamp: datetime) -> str:
+    """
+    ISO string for a product timestamp.
+    
+    Products in a batch share one timestamp, so its string is formatted once.
+    Aware datetimes in different zones compare equal but format differently,
+    hence the offset in the cache key.
+    """
+    return _format_timestamp(timestamp, timestamp.utcoffset())
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Product:
-    """Data model for a product with validation and formatting methods."""
+    """Immutable data model for a product with validation and formatting methods."""
     timestamp: datetime
     name: str
     brand: str
@@ -34,10 +90,16 @@ class Product:
     sale_label: Optional[str] = None
     image_url: Optional[str] = None
     
+    def get(self, field: str, default: Any = None) -> Any:
+        """Dict-style field access so products can be analyzed like raw product dicts."""
+        if field in self.__dataclass_fields__:
+            return getattr(self, field)
+        return default
+    
     def to_sheets_row(self) -> List[str]:
         """Convert product data to Google Sheets row format."""
         return [
-            self.timestamp.isoformat(),
+            _isoformat(self.timestamp),
             self.name,
             self.brand,
             f"${self.current_price:.2f}" if self.current_price else "",
@@ -70,7 +132,7 @@ class PriceParser:
             return None
             
         # Remove currency symbols, whitespace, and commas
-        cleaned = re.sub(r'[$,\s]', '', price_str.strip())
+        cleaned = price_str.translate(_PRICE_STRIP_TABLE)
         
         try:
             return float(cleaned)
@@ -114,8 +176,28 @@ class ProductDataProcessor:
         self.performance_monitor = PerformanceMonitor() if enable_performance_monitoring else None
         self.batch_processor = BatchProcessor(batch_size=batch_size)
         
-        # Data quality monitoring
-        self.quality_monitor = DataQualityMonitor() if enable_quality_monitoring else None
+        # Data quality monitoring; the module is only imported when it is enabled
+        if enable_quality_monitoring:
+            from .quality_monitor import DataQualityMonitor
+            self.quality_monitor = DataQualityMonitor()
+        else:
+            self.quality_monitor = None
+        
+        # Per-field cleaning rules for the non-text fields in clean_product_data:
+        # (field, default, sanitizer, sanitizer options, fallback parser)
+        price_range = {'min_value': 0.01, 'max_value': 10000.0}
+        self._field_cleaners = (
+            ('current_price', '', self.sanitizer.sanitize_float,
+             price_range, self.price_parser.parse_price),
+            ('original_price', '', self.sanitizer.sanitize_float,
+             price_range, self.price_parser.parse_price),
+            ('rating', None, self.sanitizer.sanitize_float,
+             {'min_value': 0.0, 'max_value': 5.0}, self._parse_rating),
+            ('reviews_count', None, self.sanitizer.sanitize_integer,
+             {'min_value': 0, 'max_value': 100000}, self._parse_reviews_count),
+            ('product_url', '', self.sanitizer.sanitize_url, {}, self._clean_url),
+            ('image_url', '', self.sanitizer.sanitize_url, {}, self._clean_url),
+        )
         
     def process_products(self, raw_products: List[Dict[str, Any]]) -> List[Product]:
         """
@@ -136,6 +218,14 @@ class ProductDataProcessor:
     
     def _process_products_internal(self, raw_products: List[Dict[str, Any]]) -> List[Product]:
         """Internal method for processing products."""
+        total_count = len(raw_products)
+        
+        # Drop repeated records (e.g. items repeated across pages) before the
+        # expensive cleaning and validation steps
+        raw_products, duplicate_count = self._drop_duplicate_records(raw_products)
+        if duplicate_count:
+            logger.info(f"Skipped {duplicate_count} duplicate product records")
+        
         # Use batch processing for large datasets
         if len(raw_products) > self.batch_processor.batch_size:
             processed_batches = self.batch_processor.process_in_batches(
@@ -153,38 +243,79 @@ class ProductDataProcessor:
             processed_products = batch_result['products']
             failed_count = batch_result['failed_count']
         
-        # Log processing summary
+        # Log processing summary over every record received, skipped duplicates included
         self.error_handler.log_processing_summary(
-            len(raw_products), len(processed_products), failed_count
+            total_count, len(processed_products), failed_count
         )
         
         # Perform quality analysis on processed products
         if self.quality_monitor and processed_products:
-            # Convert Product objects back to dictionaries for quality analysis
-            product_dicts = [self._product_to_dict(product) for product in processed_products]
-            quality_metrics = self.quality_monitor.analyze_data_quality(product_dicts)
+            # Product supports dict-style get(), so no conversion is needed
+            quality_metrics = self.quality_monitor.analyze_data_quality(processed_products)
             
             logger.info(f"Data quality analysis completed. Quality score: {quality_metrics.quality_score:.1f}")
             
             # Log quality alerts if any
             if self.quality_monitor.alerts:
-                recent_alerts = self.quality_monitor.alerts[-5:]  # Last 5 alerts
+                recent_alerts = self.quality_monitor.get_recent_alerts(5)
                 for alert in recent_alerts:
                     logger.warning(f"Quality Alert [{alert.severity}]: {alert.message}")
         
         return processed_products
     
+    def _drop_duplicate_records(self, raw_products: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Remove repeated raw records, keeping the first occurrence.
+        
+        Records are considered duplicates when both name and product URL match.
+        Records missing either, and malformed records that are not dicts, are
+        always kept, so they reach per-record handling and are counted as
+        failures rather than as duplicates.
+        
+        Returns:
+            Tuple of (unique records, number of records dropped)
+        """
+        seen = set()
+        unique_products = []
+        for raw_product in raw_products:
+            if not isinstance(raw_product, dict):
+                unique_products.append(raw_product)
+                continue
+            
+            name = raw_product.get('name')
+            product_url = raw_product.get('product_url')
+            if name and product_url:
+                key = (name, product_url)
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique_products.append(raw_product)
+        
+        return unique_products, len(raw_products) - len(unique_products)
+    
     def _process_product_batch(self, raw_products: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Process a batch of products and return results with statistics."""
         processed_products = []
         failed_count = 0
         
+        # Every product in a batch was scraped in the same run
+        now = datetime.now()
+        
         for raw_product in raw_products:
-            product_name = raw_product.get('name', 'Unknown')
+            product_name = 'Unknown'
             
             try:
+                product_name = raw_product.get('name', 'Unknown')
+                
+                # Records without a name or price always fail validation; skip
+                # them before the cleaning and validation steps
+                if not (raw_product.get('name') and raw_product.get('current_price')):
+                    failed_count += 1
+                    logger.warning(f"Skipped product '{product_name}': missing a name or price")
+                    continue
+                
                 # Clean the product data
-                processed_product = self.clean_product_data(raw_product)
+                processed_product = self.clean_product_data(raw_product, now=now)
                 
                 # Validate using comprehensive validator
                 validation_result = self.validator.validate_product(processed_product)
@@ -207,101 +338,52 @@ class ProductDataProcessor:
             'failed_count': failed_count
         }
     
-    def clean_product_data(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def clean_product_data(self, product: Dict[str, Any],
+                           now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Clean and normalize product data using enhanced sanitization.
         
         Args:
             product: Raw product data dictionary
+            now: Timestamp to record for the product; defaults to the current time
             
         Returns:
             Cleaned product data dictionary
         """
         cleaned = {}
+        sanitize_string = self.sanitizer.sanitize_string
+        
+        for field, max_length, allow_empty in _TEXT_FIELDS:
+            value = product.get(field, '')
+            # Text that is already clean (the usual case) would come back from
+            # the sanitizer unchanged
+            if is_clean_text(value, max_length):
+                cleaned[field] = value
+                continue
+            try:
+                cleaned[field] = sanitize_string(value, max_length=max_length, allow_empty=allow_empty)
+            except Exception:
+                cleaned[field] = self._clean_text(value)
         
-        try:
-            # Clean and validate name using sanitizer
-            cleaned['name'] = self.sanitizer.sanitize_string(
-                product.get('name', ''), max_length=200, allow_empty=False
-            )
-        except Exception:
-            cleaned['name'] = self._clean_text(product.get('name', ''))
-        
-        try:
-            # Clean and validate brand using sanitizer
-            cleaned['brand'] = self.sanitizer.sanitize_string(
-                product.get('brand', ''), max_length=100, allow_empty=True
-            )
-        except Exception:
-            cleaned['brand'] = self._clean_text(product.get('brand', ''))
-        
-        # Parse prices with enhanced error handling
-        current_price_str = product.get('current_price', '')
-        original_price_str = product.get('original_price', '')
-        
-        try:
-            cleaned['current_price'] = self.sanitizer.sanitize_float(
-                current_price_str, min_value=0.01, max_value=10000.0
-            )
-        except Exception:
-            cleaned['current_price'] = self.price_parser.parse_price(current_price_str)
-        
-        try:
-            cleaned['original_price'] = self.sanitizer.sanitize_float(
-                original_price_str, min_value=0.01, max_value=10000.0
-            )
-        except Exception:
-            cleaned['original_price'] = self.price_parser.parse_price(original_price_str)
+        # Sanitize each remaining field, falling back to the lenient parser if the sanitizer rejects it
+        for field, default, sanitize, options, fallback in self._field_cleaners:
+            value = product.get(field, default)
+            try:
+                cleaned[field] = sanitize(value, **options)
+            except Exception:
+                cleaned[field] = fallback(value)
         
-        # Calculate discount percentage
-        if cleaned['current_price'] and cleaned['original_price']:
-            cleaned['discount_percentage'] = self.price_parser.calculate_discount_percentage(
-                cleaned['current_price'], cleaned['original_price']
-            )
-        else:
-            cleaned['discount_percentage'] = None
+        # Calculate discount percentage (None when either price is missing)
+        cleaned['discount_percentage'] = self.price_parser.calculate_discount_percentage(
+            cleaned['current_price'], cleaned['original_price']
+        )
         
         # Clean availability status
         availability = product.get('availability_status', '').strip()
         cleaned['availability_status'] = self._normalize_availability_status(availability)
         
-        # Parse rating with sanitization
-        try:
-            cleaned['rating'] = self.sanitizer.sanitize_float(
-                product.get('rating'), min_value=0.0, max_value=5.0
-            )
-        except Exception:
-            cleaned['rating'] = self._parse_rating(product.get('rating'))
-        
-        # Parse reviews count with sanitization
-        try:
-            cleaned['reviews_count'] = self.sanitizer.sanitize_integer(
-                product.get('reviews_count'), min_value=0, max_value=100000
-            )
-        except Exception:
-            cleaned['reviews_count'] = self._parse_reviews_count(product.get('reviews_count'))
-        
-        # Clean URLs with enhanced validation
-        try:
-            cleaned['product_url'] = self.sanitizer.sanitize_url(product.get('product_url', ''))
-        except Exception:
-            cleaned['product_url'] = self._clean_url(product.get('product_url', ''))
-        
-        try:
-            cleaned['image_url'] = self.sanitizer.sanitize_url(product.get('image_url', ''))
-        except Exception:
-            cleaned['image_url'] = self._clean_url(product.get('image_url', ''))
-        
-        # Clean sale label
-        try:
-            cleaned['sale_label'] = self.sanitizer.sanitize_string(
-                product.get('sale_label', ''), max_length=50, allow_empty=True
-            )
-        except Exception:
-            cleaned['sale_label'] = self._clean_text(product.get('sale_label', ''))
-        
         # Add timestamp
-        cleaned['timestamp'] = datetime.now()
+        cleaned['timestamp'] = now or datetime.now()
         
         return cleaned
     
@@ -328,17 +410,17 @@ class ProductDataProcessor:
             logger.warning(f"Invalid current price: {product['current_price']}")
             return False
         
-        # Validate URL format
-        if not self._is_valid_url(product['product_url']):
-            logger.warning(f"Invalid product URL: {product['product_url']}")
-            return False
-        
         # Validate rating range if present
         if product.get('rating') is not None:
             if not (0 <= product['rating'] <= 5):
                 logger.warning(f"Invalid rating: {product['rating']}")
                 return False
         
+        # Validate URL format last, as it is the most expensive check
+        if not self._is_valid_url(product['product_url']):
+            logger.warning(f"Invalid product URL: {product['product_url']}")
+            return False
+        
         return True
     
     def _create_product_object(self, product_data: Dict[str, Any]) -> Product:
@@ -370,14 +452,17 @@ class ProductDataProcessor:
             return "Unknown"
         
         status_lower = status.lower()
-        if 'sold out' in status_lower or 'out of stock' in status_lower:
-            return "Sold out"
-        elif 'limited' in status_lower or 'few left' in status_lower:
-            return "Limited"
-        elif 'available' in status_lower or 'in stock' in status_lower:
-            return "Available"
-        else:
-            return "Available"  # Default assumption
+        
+        # Labels are usually exactly one of the known phrases
+        normalized = _AVAILABILITY_PHRASES.get(status_lower)
+        if normalized:
+            return normalized
+        
+        for phrase, normalized in _AVAILABILITY_PHRASES.items():
+            if phrase in status_lower:
+                return normalized
+        
+        return "Available"  # Default assumption
     
     def _parse_rating(self, rating_value: Any) -> Optional[float]:
         """Parse rating value to float."""
@@ -399,9 +484,9 @@ class ProductDataProcessor:
             # Handle strings like "123 reviews" or "(45)"
             if isinstance(reviews_value, str):
                 # Extract numbers from string
-                numbers = re.findall(r'\d+', reviews_value)
-                if numbers:
-                    return int(numbers[0])
+                match = _DIGITS_RE.search(reviews_value)
+                if match:
+                    return int(match.group())
             else:
                 return int(reviews_value)
         except (ValueError, TypeError):
@@ -418,24 +503,13 @@ class ProductDataProcessor:
         
         # Add base URL if relative
         if url.startswith('/'):
-            url = f"https://www.garagegrowngear.com{url}"
+            url = f"{_SITE_ORIGIN}{url}"
         
         return url
     
     def _is_valid_url(self, url: str) -> bool:
         """Basic URL validation."""
-        if not url:
-            return False
-        
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        return url_pattern.match(url) is not None
+        return is_valid_url(url)
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics for data processing operations."""
@@ -458,7 +532,7 @@ class ProductDataProcessor:
         
         return self.quality_monitor.get_quality_report()
     
-    def get_quality_metrics(self) -> Optional[DataQualityMetrics]:
+    def get_quality_metrics(self) -> Optional['DataQualityMetrics']:
         """Get the latest quality metrics."""
         if not self.quality_monitor or not self.quality_monitor.historical_metrics:
             return None
@@ -471,20 +545,3 @@ class ProductDataProcessor:
             self.quality_monitor.export_quality_report(filepath, format)
         else:
             logger.warning("Quality monitoring is not enabled")
-    
-    def _product_to_dict(self, product: 'Product') -> Dict[str, Any]:
-        """Convert Product object to dictionary for quality analysis."""
-        return {
-            'timestamp': product.timestamp,
-            'name': product.name,
-            'brand': product.brand,
-            'current_price': product.current_price,
-            'original_price': product.original_price,
-            'discount_percentage': product.discount_percentage,
-            'availability_status': product.availability_status,
-            'rating': product.rating,
-            'reviews_count': product.reviews_count,
-            'product_url': product.product_url,
-            'sale_label': product.sale_label,
-            'image_url': product.image_url
-        }
\ No newline at end of file
@@ -6,15 +6,56 @@ and reporting capabilities for scraped product data.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Set
+import math
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-import statistics
+from collections import defaultdict, Counter, deque
+from itertools import islice
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .validators import is_valid_url
+
 logger = logging.getLogger(__name__)
 
+# Alert rules checked after every analysis, in report order:
+# (alert_type, metric and threshold key, fires when below the threshold,
+#  severity for the metric value, message label, unit, (detail key, count attribute))
+_QUALITY_ALERT_RULES = (
+    ('completeness', 'completeness_rate', True,
+     lambda value: 'medium' if value > 80 else 'high', 'Data completeness rate', '%', None),
+    ('validity', 'validity_rate', True,
+     lambda value: 'high' if value < 90 else 'medium', 'Data validity rate', '%', None),
+    ('quality_score', 'quality_score', True,
+     lambda value: 'critical' if value < 70 else 'high', 'Overall quality score', '', None),
+    ('duplicates', 'duplicate_rate', False,
+     lambda value: 'medium', 'Duplicate rate', '%', ('duplicate_count', 'duplicate_products')),
+    ('missing_prices', 'missing_price_rate', False,
+     lambda value: 'high', 'Missing price rate', '%', ('missing_count', 'missing_prices')),
+)
+
+
+def _mean(values: List[float]) -> float:
+    """Arithmetic mean of a non-empty list of floats."""
+    # fsum keeps the sum correctly rounded without statistics.mean's exact
+    # fraction arithmetic, which dominates its cost on float inputs
+    return math.fsum(values) / len(values)
+
+
+def _dumps_report(report: Dict[str, Any]) -> bytes:
+    """Serialize a quality report to indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(
+            report, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(report, indent=2, default=str).encode('utf-8')
+
 
 @dataclass
 class DataQualityMetrics:
@@ -48,9 +89,26 @@ class DataQualityMetrics:
     availability_distribution: Dict[str, int] = field(default_factory=dict)
     brand_distribution: Dict[str, int] = field(default_factory=dict)
     
+    # (completeness, validity, quality) stored by finalize()
+    _scores: Optional[Tuple[float, float, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def finalize(self) -> None:
+        """
+        Compute the derived rates once and store them.
+        
+        Call after all counts are filled in; the rate properties return the
+        stored values from then on, so later count changes need another call.
+        """
+        self._scores = None
+        self._scores = (self.completeness_rate, self.validity_rate, self.quality_score)
+    
     @property
     def completeness_rate(self) -> float:
         """Calculate overall data completeness rate."""
+        if self._scores is not None:
+            return self._scores[0]
         if self.total_products == 0:
             return 0.0
         
@@ -64,6 +122,8 @@ class DataQualityMetrics:
     @property
     def validity_rate(self) -> float:
         """Calculate data validity rate."""
+        if self._scores is not None:
+            return self._scores[1]
         if self.total_products == 0:
             return 0.0
         
@@ -72,6 +132,8 @@ class DataQualityMetrics:
     @property
     def quality_score(self) -> float:
         """Calculate overall quality score (0-100)."""
+        if self._scores is not None:
+            return self._scores[2]
         completeness_weight = 0.4
         validity_weight = 0.4
         consistency_weight = 0.2
@@ -148,12 +210,14 @@ class DataQualityAlert:
 class DataQualityMonitor:
     """Comprehensive data quality monitoring and reporting system."""
     
-    def __init__(self, alert_thresholds: Optional[Dict[str, float]] = None):
+    def __init__(self, alert_thresholds: Optional[Dict[str, float]] = None,
+                 max_history_size: int = 100):
         """
         Initialize data quality monitor.
         
         Args:
             alert_thresholds: Dictionary of alert thresholds for different metrics
+            max_history_size: Number of analysis runs kept for trends and exports
         """
         self.alert_thresholds = alert_thresholds or {
             'completeness_rate': 90.0,  # Alert if completeness < 90%
@@ -164,21 +228,39 @@ class DataQualityMonitor:
             'invalid_price_rate': 5.0   # Alert if invalid prices > 5%
         }
         
-        self.historical_metrics = []
-        self.alerts = []
-        self.max_history_size = 100
+        # Oldest entries fall off the left as new ones are appended
+        self.historical_metrics = deque(maxlen=max_history_size)
+        self.alerts = deque()
+        
+        # Per-run scores kept as flat rolling series so trend analysis does
+        # not have to walk historical_metrics and recompute properties
+        self._completeness_history = deque(maxlen=max_history_size)
+        self._validity_history = deque(maxlen=max_history_size)
+        self._quality_history = deque(maxlen=max_history_size)
+        
+        # (historical_trends, quality_trend) for the current history; both
+        # only change when a new analysis is recorded
+        self._trend_cache: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
         
+    @property
+    def max_history_size(self) -> int:
+        """Number of analysis runs kept; fixed when the monitor is created."""
+        return self.historical_metrics.maxlen
+    
     def analyze_data_quality(self, products: List[Dict[str, Any]]) -> DataQualityMetrics:
         """
         Analyze data quality of a list of products.
         
         Args:
-            products: List of product dictionaries to analyze
+            products: List of product dictionaries (or Product objects, which
+                support the same get() access) to analyze
             
         Returns:
             DataQualityMetrics object with comprehensive quality analysis
         """
-        metrics = DataQualityMetrics(timestamp=datetime.now())
+        # One timestamp for the metrics and any alerts they raise
+        now = datetime.now()
+        metrics = DataQualityMetrics(timestamp=now)
         
         if not products:
             return metrics
@@ -188,247 +270,199 @@ class DataQualityMonitor:
         # Track various quality aspects
         prices = []
         discounts = []
-        seen_products = set()
-        duplicate_keys = set()
+        seen_products: Set[Tuple[str, str]] = set()
+        availability_counts: Dict[str, int] = defaultdict(int)
+        brand_counts: Dict[str, int] = defaultdict(int)
+        
+        add_price = prices.append
+        add_discount = discounts.append
+        is_valid_url = self._is_valid_url
         
         for product in products:
             # Check completeness
             self._check_field_completeness(product, metrics)
             
-            # Check validity
-            is_valid = self._check_data_validity(product, metrics, prices, discounts)
+            # Check validity; every rule is evaluated so each bad field is counted
+            is_valid = True
+            
+            current_price = product.get('current_price')
+            if current_price is not None:
+                try:
+                    price_float = float(current_price)
+                    if price_float <= 0 or price_float > 10000:  # Reasonable bounds
+                        metrics.invalid_prices += 1
+                        is_valid = False
+                    else:
+                        add_price(price_float)
+                except (ValueError, TypeError):
+                    metrics.invalid_prices += 1
+                    is_valid = False
+            
+            product_url = product.get('product_url', '')
+            if product_url and not is_valid_url(product_url):
+                metrics.invalid_urls += 1
+                is_valid = False
+            
+            rating = product.get('rating')
+            if rating is not None:
+                try:
+                    rating_float = float(rating)
+                    if rating_float < 0 or rating_float > 5:
+                        metrics.invalid_ratings += 1
+                        is_valid = False
+                except (ValueError, TypeError):
+                    metrics.invalid_ratings += 1
+                    is_valid = False
+            
+            discount = product.get('discount_percentage')
+            if discount is not None:
+                try:
+                    discount_float = float(discount)
+                    if discount_float < 0 or discount_float > 100:
+                        metrics.invalid_discounts += 1
+                        is_valid = False
+                    else:
+                        add_discount(discount_float)
+                except (ValueError, TypeError):
+                    metrics.invalid_discounts += 1
+                    is_valid = False
             
             if is_valid:
                 metrics.valid_products += 1
             else:
                 metrics.invalid_products += 1
             
-            # Check for duplicates
-            product_key = self._generate_product_key(product)
+            # Check for duplicates on the normalized (brand, name) pair
+            product_key = (str(product.get('brand', '')).strip().lower(),
+                           str(product.get('name', '')).strip().lower())
             if product_key in seen_products:
-                duplicate_keys.add(product_key)
                 metrics.duplicate_products += 1
             else:
                 seen_products.add(product_key)
             
+            # Check for price inconsistencies (current > original price)
+            original_price = product.get('original_price')
+            if (current_price is not None and original_price is not None and
+                current_price > original_price):
+                metrics.price_inconsistencies += 1
+            
             # Collect distribution data
-            self._collect_distribution_data(product, metrics)
+            availability_counts[product.get('availability_status', 'Unknown')] += 1
+            brand_counts[product.get('brand', 'Unknown')] += 1
+        
+        metrics.availability_distribution = dict(availability_counts)
+        metrics.brand_distribution = dict(brand_counts)
         
         # Calculate summary statistics
         self._calculate_summary_statistics(prices, discounts, metrics)
         
-        # Check for price inconsistencies
-        metrics.price_inconsistencies = self._check_price_inconsistencies(products)
+        # All counts are final; fix the derived rates read below and in reports
+        metrics.finalize()
         
         # Store metrics in history
         self.historical_metrics.append(metrics)
-        if len(self.historical_metrics) > self.max_history_size:
-            self.historical_metrics = self.historical_metrics[-self.max_history_size:]
+        self._completeness_history.append(metrics.completeness_rate)
+        self._validity_history.append(metrics.validity_rate)
+        self._quality_history.append(metrics.quality_score)
+        self._trend_cache = None
         
         # Generate alerts based on metrics
-        self._generate_quality_alerts(metrics)
+        self._generate_quality_alerts(metrics, now)
         
         return metrics
     
     def _check_field_completeness(self, product: Dict[str, Any], 
                                  metrics: DataQualityMetrics) -> None:
         """Check completeness of required fields."""
-        if not product.get('name') or not str(product.get('name')).strip():
+        # One lookup per field; a blank string counts as missing
+        name = product.get('name')
+        if not name or not str(name).strip():
             metrics.missing_names += 1
         
-        if not product.get('current_price') or product.get('current_price') == 0:
+        # Zero is falsy, so a zero price is reported as missing here too
+        if not product.get('current_price'):
             metrics.missing_prices += 1
         
-        if not product.get('product_url') or not str(product.get('product_url')).strip():
+        product_url = product.get('product_url')
+        if not product_url or not str(product_url).strip():
             metrics.missing_urls += 1
         
-        if not product.get('brand') or not str(product.get('brand')).strip():
+        brand = product.get('brand')
+        if not brand or not str(brand).strip():
             metrics.missing_brands += 1
         
-        if not product.get('availability_status') or not str(product.get('availability_status')).strip():
+        availability = product.get('availability_status')
+        if not availability or not str(availability).strip():
             metrics.missing_availability += 1
     
-    def _check_data_validity(self, product: Dict[str, Any], 
-                           metrics: DataQualityMetrics,
-                           prices: List[float], 
-                           discounts: List[float]) -> bool:
-        """Check validity of data values."""
-        is_valid = True
-        
-        # Check price validity
-        current_price = product.get('current_price')
-        if current_price is not None:
-            try:
-                price_float = float(current_price)
-                if price_float <= 0 or price_float > 10000:  # Reasonable bounds
-                    metrics.invalid_prices += 1
-                    is_valid = False
-                else:
-                    prices.append(price_float)
-            except (ValueError, TypeError):
-                metrics.invalid_prices += 1
-                is_valid = False
-        
-        # Check URL validity
-        product_url = product.get('product_url', '')
-        if product_url and not self._is_valid_url(product_url):
-            metrics.invalid_urls += 1
-            is_valid = False
-        
-        # Check rating validity
-        rating = product.get('rating')
-        if rating is not None:
-            try:
-                rating_float = float(rating)
-                if rating_float < 0 or rating_float > 5:
-                    metrics.invalid_ratings += 1
-                    is_valid = False
-            except (ValueError, TypeError):
-                metrics.invalid_ratings += 1
-                is_valid = False
-        
-        # Check discount validity
-        discount = product.get('discount_percentage')
-        if discount is not None:
-            try:
-                discount_float = float(discount)
-                if discount_float < 0 or discount_float > 100:
-                    metrics.invalid_discounts += 1
-                    is_valid = False
-                else:
-                    discounts.append(discount_float)
-            except (ValueError, TypeError):
-                metrics.invalid_discounts += 1
-                is_valid = False
-        
-        return is_valid
-    
-    def _generate_product_key(self, product: Dict[str, Any]) -> str:
-        """Generate a unique key for duplicate detection."""
-        name = str(product.get('name', '')).strip().lower()
-        brand = str(product.get('brand', '')).strip().lower()
-        return f"{brand}:{name}"
-    
-    def _collect_distribution_data(self, product: Dict[str, Any], 
-                                  metrics: DataQualityMetrics) -> None:
-        """Collect data for distribution analysis."""
-        # Availability distribution
-        availability = product.get('availability_status', 'Unknown')
-        if availability not in metrics.availability_distribution:
-            metrics.availability_distribution[availability] = 0
-        metrics.availability_distribution[availability] += 1
-        
-        # Brand distribution
-        brand = product.get('brand', 'Unknown')
-        if brand not in metrics.brand_distribution:
-            metrics.brand_distribution[brand] = 0
-        metrics.brand_distribution[brand] += 1
-    
     def _calculate_summary_statistics(self, prices: List[float], 
                                     discounts: List[float],
                                     metrics: DataQualityMetrics) -> None:
         """Calculate summary statistics from collected data."""
         if prices:
-            metrics.avg_price = statistics.mean(prices)
+            metrics.avg_price = _mean(prices)
+            # One sort yields min, max and median; statistics.median would
+            # sort again on top of separate min() and max() scans
+            ordered = sorted(prices)
+            mid = len(ordered) // 2
+            if len(ordered) % 2:
+                median = ordered[mid]
+            else:
+                median = (ordered[mid - 1] + ordered[mid]) / 2
             metrics.price_range = {
-                'min': min(prices),
-                'max': max(prices),
-                'median': statistics.median(prices)
+                'min': ordered[0],
+                'max': ordered[-1],
+                'median': median
             }
         
         if discounts:
-            metrics.avg_discount = statistics.mean(discounts)
-    
-    def _check_price_inconsistencies(self, products: List[Dict[str, Any]]) -> int:
-        """Check for price inconsistencies (current > original price)."""
-        inconsistencies = 0
-        
-        for product in products:
-            current_price = product.get('current_price')
-            original_price = product.get('original_price')
-            
-            if (current_price is not None and original_price is not None and
-                current_price > original_price):
-                inconsistencies += 1
-        
-        return inconsistencies
+            metrics.avg_discount = _mean(discounts)
     
     def _is_valid_url(self, url: str) -> bool:
         """Basic URL validation."""
-        import re
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'
-            r'localhost|'
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-            r'(?::\d+)?'
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return bool(url_pattern.match(url))
+        return is_valid_url(url)
     
-    def _generate_quality_alerts(self, metrics: DataQualityMetrics) -> None:
+    def _generate_quality_alerts(self, metrics: DataQualityMetrics,
+                                 now: Optional[datetime] = None) -> None:
         """Generate alerts based on quality metrics."""
-        alerts = []
+        now = now or datetime.now()
+        thresholds = self.alert_thresholds
         
-        # Completeness alerts
-        if metrics.completeness_rate < self.alert_thresholds['completeness_rate']:
-            alerts.append(DataQualityAlert(
-                timestamp=datetime.now(),
-                alert_type='completeness',
-                severity='medium' if metrics.completeness_rate > 80 else 'high',
-                message=f"Data completeness rate is {metrics.completeness_rate:.1f}%, below threshold of {self.alert_thresholds['completeness_rate']}%",
-                details={'completeness_rate': metrics.completeness_rate}
-            ))
-        
-        # Validity alerts
-        if metrics.validity_rate < self.alert_thresholds['validity_rate']:
-            alerts.append(DataQualityAlert(
-                timestamp=datetime.now(),
-                alert_type='validity',
-                severity='high' if metrics.validity_rate < 90 else 'medium',
-                message=f"Data validity rate is {metrics.validity_rate:.1f}%, below threshold of {self.alert_thresholds['validity_rate']}%",
-                details={'validity_rate': metrics.validity_rate}
-            ))
-        
-        # Quality score alerts
-        if metrics.quality_score < self.alert_thresholds['quality_score']:
-            alerts.append(DataQualityAlert(
-                timestamp=datetime.now(),
-                alert_type='quality_score',
-                severity='critical' if metrics.quality_score < 70 else 'high',
-                message=f"Overall quality score is {metrics.quality_score:.1f}, below threshold of {self.alert_thresholds['quality_score']}",
-                details={'quality_score': metrics.quality_score}
-            ))
-        
-        # Duplicate alerts
+        values = {
+            'completeness_rate': metrics.completeness_rate,
+            'validity_rate': metrics.validity_rate,
+            'quality_score': metrics.quality_score,
+        }
         if metrics.total_products > 0:
-            duplicate_rate = (metrics.duplicate_products / metrics.total_products) * 100
-            if duplicate_rate > self.alert_thresholds['duplicate_rate']:
-                alerts.append(DataQualityAlert(
-                    timestamp=datetime.now(),
-                    alert_type='duplicates',
-                    severity='medium',
-                    message=f"Duplicate rate is {duplicate_rate:.1f}%, above threshold of {self.alert_thresholds['duplicate_rate']}%",
-                    details={'duplicate_rate': duplicate_rate, 'duplicate_count': metrics.duplicate_products}
-                ))
+            values['duplicate_rate'] = (metrics.duplicate_products / metrics.total_products) * 100
+            values['missing_price_rate'] = (metrics.missing_prices / metrics.total_products) * 100
         
-        # Missing price alerts
-        if metrics.total_products > 0:
-            missing_price_rate = (metrics.missing_prices / metrics.total_products) * 100
-            if missing_price_rate > self.alert_thresholds['missing_price_rate']:
+        alerts = []
+        for alert_type, key, below, severity, label, unit, count in _QUALITY_ALERT_RULES:
+            if key not in values:
+                continue
+            value = values[key]
+            threshold = thresholds[key]
+            if (value < threshold) if below else (value > threshold):
+                details = {key: value}
+                if count:
+                    details[count[0]] = getattr(metrics, count[1])
                 alerts.append(DataQualityAlert(
-                    timestamp=datetime.now(),
-                    alert_type='missing_prices',
-                    severity='high',
-                    message=f"Missing price rate is {missing_price_rate:.1f}%, above threshold of {self.alert_thresholds['missing_price_rate']}%",
-                    details={'missing_price_rate': missing_price_rate, 'missing_count': metrics.missing_prices}
+                    timestamp=now,
+                    alert_type=alert_type,
+                    severity=severity(value),
+                    message=(f"{label} is {value:.1f}{unit}, "
+                             f"{'below' if below else 'above'} threshold of {threshold}{unit}"),
+                    details=details
                 ))
         
         # Add alerts to history
         self.alerts.extend(alerts)
         
-        # Keep only recent alerts (last 24 hours)
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        self.alerts = [alert for alert in self.alerts if alert.timestamp > cutoff_time]
+        # Keep only recent alerts (last 24 hours); alerts are appended in time order
+        cutoff_time = now - timedelta(hours=24)
+        while self.alerts and self.alerts[0].timestamp <= cutoff_time:
+            self.alerts.popleft()
     
     def get_quality_report(self, include_history: bool = True) -> Dict[str, Any]:
         """
@@ -443,7 +477,7 @@ class DataQualityMonitor:
         report = {
             'generated_at': datetime.now().isoformat(),
             'current_metrics': None,
-            'recent_alerts': [alert.to_dict() for alert in self.alerts[-10:]],
+            'recent_alerts': [alert.to_dict() for alert in self.get_recent_alerts(10)],
             'alert_summary': self._get_alert_summary()
         }
         
@@ -451,11 +485,20 @@ class DataQualityMonitor:
             report['current_metrics'] = self.historical_metrics[-1].to_dict()
         
         if include_history and len(self.historical_metrics) > 1:
-            report['historical_trends'] = self._calculate_trends()
-            report['quality_trend'] = self._get_quality_trend()
+            if self._trend_cache is None:
+                self._trend_cache = (self._calculate_trends(), self._get_quality_trend())
+            # Both dicts hold only scalars, so a shallow copy keeps the cache
+            # safe from callers editing the report
+            historical_trends, quality_trend = self._trend_cache
+            report['historical_trends'] = dict(historical_trends)
+            report['quality_trend'] = dict(quality_trend)
         
         return report
     
+    def get_recent_alerts(self, count: int = 10) -> List[DataQualityAlert]:
+        """Get the most recent alerts, oldest first."""
+        return self._recent(self.alerts, count)
+    
     def _get_alert_summary(self) -> Dict[str, Any]:
         """Get summary of recent alerts."""
         if not self.alerts:
@@ -476,35 +519,41 @@ class DataQualityMonitor:
         if len(self.historical_metrics) < 2:
             return {}
         
-        recent_metrics = self.historical_metrics[-5:]  # Last 5 runs
-        
-        completeness_rates = [m.completeness_rate for m in recent_metrics]
-        validity_rates = [m.validity_rate for m in recent_metrics]
-        quality_scores = [m.quality_score for m in recent_metrics]
+        # Last 5 runs
+        completeness_rates = self._recent(self._completeness_history)
+        validity_rates = self._recent(self._validity_history)
+        quality_scores = self._recent(self._quality_history)
         
         return {
             'completeness_trend': self._calculate_trend(completeness_rates),
             'validity_trend': self._calculate_trend(validity_rates),
             'quality_trend': self._calculate_trend(quality_scores),
-            'avg_completeness': statistics.mean(completeness_rates),
-            'avg_validity': statistics.mean(validity_rates),
-            'avg_quality_score': statistics.mean(quality_scores)
+            'avg_completeness': _mean(completeness_rates),
+            'avg_validity': _mean(validity_rates),
+            'avg_quality_score': _mean(quality_scores)
         }
     
+    @staticmethod
+    def _recent(series: deque, count: int = 5) -> List[Any]:
+        """Return the last count items of a rolling series."""
+        return list(islice(series, max(len(series) - count, 0), None))
+    
     def _calculate_trend(self, values: List[float]) -> str:
         """Calculate trend direction from a list of values."""
-        if len(values) < 2:
+        n = len(values)
+        if n < 2:
             return 'stable'
         
-        # Simple trend calculation
-        first_half = statistics.mean(values[:len(values)//2])
-        second_half = statistics.mean(values[len(values)//2:])
-        
-        diff = second_half - first_half
+        # Least-squares slope over evenly spaced runs, in one pass
+        x_mean = (n - 1) / 2
+        y_mean = sum(values) / n
+        covariance = sum((i - x_mean) * (value - y_mean) for i, value in enumerate(values))
+        variance = n * (n * n - 1) / 12  # sum((i - x_mean) ** 2) for i in range(n)
+        slope = covariance / variance
         
-        if abs(diff) < 1.0:  # Less than 1% change
+        if abs(slope) < 0.5:  # Less than half a point per run
             return 'stable'
-        elif diff > 0:
+        elif slope > 0:
             return 'improving'
         else:
             return 'declining'
@@ -514,11 +563,11 @@ class DataQualityMonitor:
         if len(self.historical_metrics) < 2:
             return {'trend': 'insufficient_data'}
         
-        recent_scores = [m.quality_score for m in self.historical_metrics[-5:]]
+        recent_scores = self._recent(self._quality_history)
         trend = self._calculate_trend(recent_scores)
         
         current_score = recent_scores[-1]
-        avg_score = statistics.mean(recent_scores)
+        avg_score = _mean(recent_scores)
         
         assessment = 'good'
         if avg_score < 70:
@@ -556,17 +605,21 @@ class DataQualityMonitor:
         report = self.get_quality_report()
         
         if format.lower() == 'json':
-            with open(filepath, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps_report(report))
         elif format.lower() == 'csv':
             # Export metrics to CSV
             import csv
             with open(filepath, 'w', newline='') as f:
                 if self.historical_metrics:
-                    writer = csv.DictWriter(f, fieldnames=self.historical_metrics[0].to_dict().keys())
-                    writer.writeheader()
-                    for metrics in self.historical_metrics:
-                        writer.writerow(metrics.to_dict())
+                    # to_dict keys come out in a fixed order, so rows stream as
+                    # plain value sequences under the first entry's keys
+                    first = self.historical_metrics[0].to_dict()
+                    writer = csv.writer(f)
+                    writer.writerow(first.keys())
+                    writer.writerow(first.values())
+                    writer.writerows(metrics.to_dict().values()
+                                     for metrics in islice(self.historical_metrics, 1, None))
         else:
             raise ValueError(f"Unsupported format: {format}")
         
@@ -6,13 +6,38 @@ for product data processing.
 """
 
 import re
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Set, Union
 from datetime import datetime
 import logging
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+_SITE_ORIGIN = 'https://www.garagegrowngear.com'
+_SITE_URL_PREFIX = _SITE_ORIGIN + '/'
+
+# Fields every product must have a non-empty value for
+_REQUIRED_FIELDS = ('name', 'current_price', 'product_url')
+
+# Statuses produced by ProductDataProcessor._normalize_availability_status
+_VALID_AVAILABILITY_STATUSES = frozenset(('Available', 'Sold out', 'Limited', 'Unknown'))
+
+# Deletes C0 and C1 control characters in a single translate() pass
+_CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
+# Patterns used by DataSanitizer, compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+_CURRENCY_RE = re.compile(r'[$,\s]')
+_DIGITS_RE = re.compile(r'\d+')
+_URL_RE = re.compile(
+    r'^https?://'
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'
+    r'localhost|'
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
+    r'(?::\d+)?'
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
@@ -65,6 +90,64 @@ class ValidationResult:
         return len(self.errors) > 0
 
 
+def is_clean_text(value: Any, max_length: int) -> bool:
+    """
+    Check whether DataSanitizer.sanitize_string would return value unchanged.
+    
+    True for non-empty strings that are printable, trimmed, single-spaced and
+    no longer than max_length, which is how scraped names and brands usually arrive.
+    """
+    return (isinstance(value, str) and 0 < len(value) <= max_length and value.isprintable()
+            and '  ' not in value and value[0] != ' ' and value[-1] != ' ')
+
+
+def is_valid_url(url: str) -> bool:
+    """
+    Check that url is an absolute http(s) URL with a plausible host.
+    
+    Store links are accepted by the pattern exactly when the path has no
+    whitespace, so they skip the regex; any other URL is matched against it.
+    """
+    if not url:
+        return False
+    
+    if url.startswith(_SITE_URL_PREFIX):
+        path = url[len(_SITE_URL_PREFIX):]
+        if not path or path.split() == [path]:
+            return True
+    
+    return _URL_RE.match(url) is not None
+
+
+@lru_cache(maxsize=4096)
+def _normalize_url(url: str, require_https: bool) -> str:
+    """
+    Complete and validate a stripped URL string for DataSanitizer.sanitize_url.
+    
+    Cached because the same product and image URLs are sanitized when products
+    are cleaned, validated again afterwards, and seen again on every run.
+    Rejected URLs raise and so are not cached.
+    """
+    # Add protocol if missing
+    if url and not url.startswith(('http://', 'https://')):
+        if url.startswith('//'):
+            url = 'https:' + url
+        elif url.startswith('/'):
+            url = _SITE_ORIGIN + url
+        else:
+            url = 'https://' + url
+    
+    # Validate URL format
+    if not is_valid_url(url):
+        raise DataSanitizationError(f"Invalid URL format: {url}")
+    
+    # Check HTTPS requirement
+    if require_https and not url.startswith('https://'):
+        raise DataSanitizationError(f"HTTPS required but URL uses HTTP: {url}")
+    
+    return url
+
+
 class DataSanitizer:
     """Utility class for data type conversion and sanitization."""
     
@@ -96,13 +179,13 @@ class DataSanitizer:
             sanitized = str(value).strip()
             
             # Remove control characters and normalize whitespace
-            sanitized = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', sanitized)
-            sanitized = re.sub(r'\s+', ' ', sanitized)
+            sanitized = sanitized.translate(_CONTROL_CHARS_TABLE)
+            sanitized = _WHITESPACE_RE.sub(' ', sanitized)
             
             # Check length
             if max_length and len(sanitized) > max_length:
                 sanitized = sanitized[:max_length].strip()
-                logger.warning(f"String truncated to {max_length} characters: {sanitized[:50]}...")
+                logger.warning("String truncated to %s characters: %s...", max_length, sanitized[:50])
             
             # Check if empty when not allowed
             if not allow_empty and not sanitized:
@@ -137,7 +220,7 @@ class DataSanitizer:
             # Handle string values
             if isinstance(value, str):
                 # Remove currency symbols and commas
-                cleaned = re.sub(r'[$,\s]', '', value.strip())
+                cleaned = _CURRENCY_RE.sub('', value.strip())
                 if not cleaned:
                     return None
                 sanitized = float(cleaned)
@@ -154,7 +237,7 @@ class DataSanitizer:
             return sanitized
             
         except ValueError:
-            logger.warning(f"Failed to convert to float: {value}")
+            logger.warning("Failed to convert to float: %s", value)
             return None
         except DataSanitizationError:
             raise
@@ -184,11 +267,15 @@ class DataSanitizer:
         try:
             # Handle string values with numbers
             if isinstance(value, str):
-                # Extract first number from string
-                numbers = re.findall(r'\d+', value.strip())
-                if not numbers:
-                    return None
-                sanitized = int(numbers[0])
+                if value.isdecimal():
+                    # Already a bare number; isdecimal() accepts exactly what \d does
+                    sanitized = int(value)
+                else:
+                    # Extract first number from string
+                    match = _DIGITS_RE.search(value)
+                    if not match:
+                        return None
+                    sanitized = int(match.group())
             else:
                 sanitized = int(float(value))  # Handle float to int conversion
             
@@ -202,7 +289,7 @@ class DataSanitizer:
             return sanitized
             
         except ValueError:
-            logger.warning(f"Failed to convert to integer: {value}")
+            logger.warning("Failed to convert to integer: %s", value)
             return None
         except DataSanitizationError:
             raise
@@ -229,38 +316,10 @@ class DataSanitizer:
         
         try:
             url = str(value).strip()
-            
-            # Add protocol if missing
-            if url and not url.startswith(('http://', 'https://')):
-                if url.startswith('//'):
-                    url = 'https:' + url
-                elif url.startswith('/'):
-                    url = 'https://www.garagegrowngear.com' + url
-                else:
-                    url = 'https://' + url
-            
-            # Validate URL format
-            url_pattern = re.compile(
-                r'^https?://'
-                r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'
-                r'localhost|'
-                r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
-                r'(?::\d+)?'
-                r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-            
-            if not url_pattern.match(url):
-                raise DataSanitizationError(f"Invalid URL format: {url}")
-            
-            # Check HTTPS requirement
-            if require_https and not url.startswith('https://'):
-                raise DataSanitizationError(f"HTTPS required but URL uses HTTP: {url}")
-            
-            return url
-            
-        except DataSanitizationError:
-            raise
         except Exception as e:
             raise DataSanitizationError(f"Failed to sanitize URL: {str(e)}")
+        
+        return _normalize_url(url, require_https)
 
 
 class ProductValidator:
@@ -282,31 +341,37 @@ class ProductValidator:
         result = ValidationResult()
         
         # Validate required fields
-        self._validate_required_fields(product_data, result)
+        missing = self._validate_required_fields(product_data, result)
         
-        # Validate individual fields
-        self._validate_name(product_data.get('name'), result)
+        # Validate individual fields; checks on a required field that is
+        # already reported missing would only repeat that error
+        if 'name' not in missing:
+            self._validate_name(product_data.get('name'), result)
         self._validate_brand(product_data.get('brand'), result)
-        self._validate_prices(product_data, result)
+        if 'current_price' not in missing:
+            self._validate_prices(product_data, result)
         self._validate_availability(product_data.get('availability_status'), result)
         self._validate_rating(product_data.get('rating'), result)
         self._validate_reviews_count(product_data.get('reviews_count'), result)
-        self._validate_urls(product_data, result)
+        self._validate_urls(product_data, result, check_product_url='product_url' not in missing)
         
         return result
     
     def _validate_required_fields(self, product_data: Dict[str, Any], 
-                                 result: ValidationResult):
-        """Validate that required fields are present."""
-        required_fields = ['name', 'current_price', 'product_url']
+                                 result: ValidationResult) -> Set[str]:
+        """Validate that required fields are present, returning those that are missing."""
+        missing = set()
         
-        for field in required_fields:
-            if field not in product_data or not product_data[field]:
+        for field in _REQUIRED_FIELDS:
+            if not product_data.get(field):
+                missing.add(field)
                 result.add_issue(
                     ValidationSeverity.ERROR,
                     field,
                     f"Required field '{field}' is missing or empty"
                 )
+        
+        return missing
     
     def _validate_name(self, name: Any, result: ValidationResult):
         """Validate product name."""
@@ -315,7 +380,11 @@ class ProductValidator:
                 result.add_issue(ValidationSeverity.ERROR, 'name', "Product name is required")
                 return
             
-            sanitized_name = self.sanitizer.sanitize_string(name, max_length=200, allow_empty=False)
+            # Names cleaned by ProductDataProcessor come through unchanged
+            if is_clean_text(name, 200):
+                sanitized_name = name
+            else:
+                sanitized_name = self.sanitizer.sanitize_string(name, max_length=200, allow_empty=False)
             
             if len(sanitized_name) < 3:
                 result.add_issue(ValidationSeverity.WARNING, 'name', 
@@ -328,7 +397,10 @@ class ProductValidator:
         """Validate product brand."""
         try:
             if brand:
-                sanitized_brand = self.sanitizer.sanitize_string(brand, max_length=100)
+                if is_clean_text(brand, 100):
+                    sanitized_brand = brand
+                else:
+                    sanitized_brand = self.sanitizer.sanitize_string(brand, max_length=100)
                 if len(sanitized_brand) < 2:
                     result.add_issue(ValidationSeverity.WARNING, 'brand', 
                                    f"Brand name is very short: '{sanitized_brand}'")
@@ -381,11 +453,14 @@ class ProductValidator:
                            "Availability status not provided")
             return
         
+        # Normalized statuses are already clean, so they need no sanitizing
+        if isinstance(availability, str) and availability in _VALID_AVAILABILITY_STATUSES:
+            return
+        
         try:
             sanitized = self.sanitizer.sanitize_string(availability, max_length=50)
-            valid_statuses = ['Available', 'Sold out', 'Limited', 'Unknown']
             
-            if sanitized not in valid_statuses:
+            if sanitized not in _VALID_AVAILABILITY_STATUSES:
                 result.add_issue(ValidationSeverity.INFO, 'availability_status', 
                                f"Unusual availability status: '{sanitized}'")
                 
@@ -420,18 +495,20 @@ class ProductValidator:
         except DataSanitizationError as e:
             result.add_issue(ValidationSeverity.WARNING, 'reviews_count', str(e))
     
-    def _validate_urls(self, product_data: Dict[str, Any], result: ValidationResult):
+    def _validate_urls(self, product_data: Dict[str, Any], result: ValidationResult,
+                       check_product_url: bool = True):
         """Validate URL fields."""
         # Validate product URL (required)
-        try:
-            product_url = product_data.get('product_url')
-            if not product_url:
-                result.add_issue(ValidationSeverity.ERROR, 'product_url', "Product URL is required")
-            else:
-                self.sanitizer.sanitize_url(product_url)
-                
-        except DataSanitizationError as e:
-            result.add_issue(ValidationSeverity.ERROR, 'product_url', str(e))
+        if check_product_url:
+            try:
+                product_url = product_data.get('product_url')
+                if not product_url:
+                    result.add_issue(ValidationSeverity.ERROR, 'product_url', "Product URL is required")
+                else:
+                    self.sanitizer.sanitize_url(product_url)
+                    
+            except DataSanitizationError as e:
+                result.add_issue(ValidationSeverity.ERROR, 'product_url', str(e))
         
         # Validate image URL (optional)
         try:
@@ -460,15 +537,17 @@ class ErrorHandler:
         Returns:
             True if product should be processed despite issues, False if it should be skipped
         """
+        # Arguments are passed through so the issue lists are only formatted
+        # when a record is actually emitted at that level
         if validation_result.has_errors():
-            self.logger.error(f"Validation failed for product '{product_name}': {validation_result.errors}")
+            self.logger.error("Validation failed for product '%s': %s", product_name, validation_result.errors)
             return False
         
         if validation_result.warnings:
-            self.logger.warning(f"Validation warnings for product '{product_name}': {validation_result.warnings}")
+            self.logger.warning("Validation warnings for product '%s': %s", product_name, validation_result.warnings)
         
         if validation_result.info:
-            self.logger.info(f"Validation info for product '{product_name}': {validation_result.info}")
+            self.logger.info("Validation info for product '%s': %s", product_name, validation_result.info)
         
         return True
     
@@ -484,10 +563,10 @@ class ErrorHandler:
             True if processing should continue with other products, False if it should stop
         """
         if isinstance(error, (ValidationError, DataSanitizationError)):
-            self.logger.error(f"Data error for product '{product_name}': {str(error)}")
+            self.logger.error("Data error for product '%s': %s", product_name, error)
             return True  # Continue with other products
         
-        self.logger.error(f"Unexpected error processing product '{product_name}': {str(error)}", exc_info=True)
+        self.logger.error("Unexpected error processing product '%s': %s", product_name, error, exc_info=True)
         return True  # Continue with other products by default
     
     def log_processing_summary(self, total_products: int, successful_products: int, 
@@ -495,8 +574,8 @@ class ErrorHandler:
         """Log a summary of processing results."""
         success_rate = (successful_products / total_products * 100) if total_products > 0 else 0
         
-        self.logger.info(f"Processing complete: {successful_products}/{total_products} products successful "
-                        f"({success_rate:.1f}% success rate)")
+        self.logger.info("Processing complete: %s/%s products successful (%.1f%% success rate)",
+                         successful_products, total_products, success_rate)
         
         if failed_products > 0:
-            self.logger.warning(f"{failed_products} products failed processing")
\ No newline at end of file
+            self.logger.warning("%s products failed processing", failed_products)
\ No newline at end of file
@@ -7,6 +7,7 @@ This example demonstrates how to use the scraper with all features enabled.
 
 import os
 import sys
+from dataclasses import replace
 from datetime import datetime
 
 # Add parent directory to path to import modules
@@ -101,15 +102,21 @@ def demonstrate_change_detection():
     modified_products = create_sample_products()
     
     # Price drop on hiking boots
-    modified_products[0].current_price = 69.99  # Significant drop
-    modified_products[0].discount_percentage = 46.2
+    modified_products[0] = replace(
+        modified_products[0],
+        current_price=69.99,  # Significant drop
+        discount_percentage=46.2
+    )
     
     # Tent back in stock
-    modified_products[1].availability_status = "Available"
+    modified_products[1] = replace(modified_products[1], availability_status="Available")
     
     # Jacket price increase
-    modified_products[2].current_price = 89.99
-    modified_products[2].availability_status = "Available"  # Back in stock too
+    modified_products[2] = replace(
+        modified_products[2],
+        current_price=89.99,
+        availability_status="Available"  # Back in stock too
+    )
     
     results2 = change_detector.process_products_and_notify(modified_products)
     
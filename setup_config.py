@@ -11,13 +11,13 @@ import base64
 from pathlib import Path
 from typing import Dict, Any
 
-from config import AppConfig, ConfigurationError
+from config import AppConfig, ConfigurationError, is_valid_spreadsheet_id
 
 
 def check_python_version():
     """Check if Python version is compatible."""
-    if sys.version_info < (3, 8):
-        print("❌ Error: Python 3.8 or higher is required")
+    if sys.version_info < (3, 10):
+        print("❌ Error: Python 3.10 or higher is required")
         print(f"Current version: {sys.version}")
         return False
     print(f"✅ Python version: {sys.version.split()[0]}")
@@ -137,6 +137,10 @@ def validate_spreadsheet_id():
         print(f"❌ SPREADSHEET_ID appears to have incorrect length: {len(spreadsheet_id)} (expected 44)")
         return False
     
+    if not is_valid_spreadsheet_id(spreadsheet_id):
+        print("❌ SPREADSHEET_ID contains characters other than letters, digits, '-' and '_'")
+        return False
+    
     print("✅ SPREADSHEET_ID format looks correct")
     return True
 
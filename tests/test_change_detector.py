@@ -0,0 +1,150 @@
+"""
+Tests for change detection functionality.
+"""
+
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from data_processing.change_detector import ProductHistoryManager, ChangeDetector
+from data_processing.product_data_processor import Product
+
+
+def make_product(url: str, price: float, availability: str = 'Available') -> Product:
+    """Build a minimal product for change detection tests."""
+    return Product(
+        timestamp=datetime.now(),
+        name=f'Product {url}',
+        brand='Test Brand',
+        current_price=price,
+        original_price=None,
+        discount_percentage=None,
+        availability_status=availability,
+        rating=None,
+        reviews_count=None,
+        product_url=url,
+    )
+
+
+class TestProductHistoryManager(unittest.TestCase):
+    """Test cases for ProductHistoryManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history_file = Path(self.temp_dir.name) / 'history.json'
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_journal_replayed_on_load(self):
+        """Test that saved updates are journaled and replayed by a new manager."""
+        manager = ProductHistoryManager(str(self.history_file))
+        manager.update_product_history(make_product('https://example.com/a', 10.0))
+        manager.save_current_state()
+        manager.update_product_history(make_product('https://example.com/a', 8.0))
+        manager.update_product_history(make_product('https://example.com/b', 5.0))
+        manager.save_current_state()
+
+        self.assertFalse(self.history_file.exists())
+        self.assertEqual(len(manager.journal_file.read_bytes().splitlines()), 3)
+
+        reloaded = ProductHistoryManager(str(self.history_file))
+        self.assertEqual(reloaded.history, manager.history)
+        self.assertEqual(reloaded.get_product_history('https://example.com/a')['current_price'], 8.0)
+
+    def test_compact_merges_journal(self):
+        """Test that compaction writes the base file and removes the journal."""
+        manager = ProductHistoryManager(str(self.history_file))
+        manager.update_product_history(make_product('https://example.com/a', 10.0))
+        manager.save_current_state()
+        manager.compact()
+
+        self.assertTrue(self.history_file.exists())
+        self.assertFalse(manager.journal_file.exists())
+        self.assertEqual(ProductHistoryManager(str(self.history_file)).history, manager.history)
+
+    def test_unchanged_products_not_journaled(self):
+        """Test that re-seen unchanged products are only journaled once their last_seen is due."""
+        manager = ProductHistoryManager(str(self.history_file))
+        products = [make_product('https://example.com/a', 10.0), make_product('https://example.com/b', 5.0)]
+        for product in products:
+            manager.update_product_history(product)
+        manager.save_current_state()
+
+        for product in products:
+            manager.update_product_history(replace(product, timestamp=product.timestamp + timedelta(minutes=30)))
+        manager.save_current_state()
+        manager.cleanup_old_entries()
+
+        self.assertFalse(self.history_file.exists())
+        self.assertEqual(len(manager.journal_file.read_bytes().splitlines()), 2)
+
+        for product in products:
+            manager.update_product_history(replace(product, timestamp=product.timestamp + timedelta(days=2)))
+        manager.save_current_state()
+
+        self.assertEqual(len(manager.journal_file.read_bytes().splitlines()), 4)
+
+    def test_cleanup_old_entries(self):
+        """Test that stale, legacy and malformed entries are handled by cleanup."""
+        manager = ProductHistoryManager(str(self.history_file))
+        manager.update_product_history(make_product('https://example.com/fresh', 10.0))
+        manager.history['https://example.com/stale'] = {
+            'last_seen_ts': (datetime.now() - timedelta(days=40)).timestamp()
+        }
+        # Entries from before last_seen_ts was recorded only carry the ISO string
+        manager.history['https://example.com/legacy'] = {
+            'last_seen': (datetime.now() - timedelta(days=1)).isoformat()
+        }
+        manager.history['https://example.com/invalid'] = {'last_seen': 'not a date'}
+
+        manager.cleanup_old_entries(days_to_keep=30)
+
+        self.assertEqual(
+            sorted(manager.history),
+            ['https://example.com/fresh', 'https://example.com/legacy']
+        )
+
+
+class TestChangeDetector(unittest.TestCase):
+    """Test cases for ChangeDetector."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        history_file = Path(self.temp_dir.name) / 'history.json'
+        self.detector = ChangeDetector(20.0, ProductHistoryManager(str(history_file)))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_detect_changes(self):
+        """Test detection of new products, price and availability changes."""
+        changes = self.detector.detect_changes([
+            make_product('https://example.com/a', 100.0),
+            make_product('https://example.com/b', 50.0, 'Sold out'),
+        ])
+        self.assertEqual([c.change_type for c in changes], ['new_product', 'new_product'])
+
+        changes = self.detector.detect_changes([
+            make_product('https://example.com/a', 70.0),
+            make_product('https://example.com/b', 50.0),
+        ])
+        by_type = {c.change_type: c for c in changes}
+        self.assertEqual(set(by_type), {'price_drop', 'back_in_stock'})
+        self.assertEqual(by_type['price_drop'].priority, 'high')
+        self.assertAlmostEqual(by_type['price_drop'].change_percentage, 30.0)
+
+        summary = self.detector.generate_summary(changes, 2)
+        self.assertEqual(summary.price_drops, 1)
+        self.assertEqual(summary.significant_price_drops, 1)
+        self.assertEqual(summary.back_in_stock, 1)
+        self.assertEqual(len(summary.priority_deals), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
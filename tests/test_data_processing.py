@@ -3,8 +3,11 @@ Tests for data processing and validation functionality.
 """
 
 import unittest
-from datetime import datetime
-from data_processing import ProductDataProcessor, ValidationError, DataSanitizationError
+from datetime import datetime, timedelta, timezone
+from data_processing import (
+    Product, ProductDataProcessor, ProductValidator, DataSanitizer,
+    ValidationError, DataSanitizationError
+)
 
 
 class TestProductDataProcessor(unittest.TestCase):
@@ -56,6 +59,108 @@ class TestProductDataProcessor(unittest.TestCase):
         # Should return empty list due to validation failures
         self.assertEqual(len(products), 0)
     
+    def test_duplicate_records_processed_once(self):
+        """Test that repeated raw records are only processed once."""
+        raw_product = {
+            'name': 'Test Product',
+            'brand': 'Test Brand',
+            'current_price': '$29.99',
+            'availability_status': 'Available',
+            'product_url': 'https://www.garagegrowngear.com/products/test'
+        }
+        
+        with self.assertLogs('data_processing.product_data_processor', level='INFO') as logs:
+            products = self.processor.process_products([raw_product, dict(raw_product)])
+        
+        self.assertEqual(len(products), 1)
+        self.assertIn('Skipped 1 duplicate product records', '\n'.join(logs.output))
+        self.assertIn('1/2 products successful', '\n'.join(logs.output))
+    
+    def test_placeholder_records_not_treated_as_duplicates(self):
+        """Test that records without a name and URL fail instead of being deduplicated."""
+        raw_products = [
+            {
+                'name': f'Test Product {i}',
+                'brand': f'Test Brand {i}',
+                'current_price': '$29.99',
+                'availability_status': 'Available',
+                'product_url': f'https://www.garagegrowngear.com/products/test-{i}'
+            }
+            for i in range(5)
+        ] + [{} for _ in range(20)]
+        
+        with self.assertLogs('data_processing.product_data_processor', level='INFO') as logs:
+            products = self.processor.process_products(raw_products)
+        
+        output = '\n'.join(logs.output)
+        self.assertEqual(len(products), 5)
+        self.assertNotIn('duplicate product records', output)
+        self.assertIn('5/25 products successful', output)
+        self.assertIn('20 products failed processing', output)
+        
+        metrics = self.processor.get_quality_metrics()
+        self.assertEqual(metrics.total_products, 5)
+        self.assertEqual(metrics.duplicate_products, 0)
+        self.assertFalse(any(alert.alert_type == 'duplicates' for alert in self.processor.quality_monitor.alerts))
+    
+    def test_records_missing_name_or_price_logged_individually(self):
+        """Test that each record skipped for a missing name or price gets its own warning."""
+        raw_products = [
+            {'name': 'No Price', 'product_url': 'https://www.garagegrowngear.com/products/a'},
+            {'current_price': '$9.99', 'product_url': 'https://www.garagegrowngear.com/products/b'},
+        ]
+        
+        with self.assertLogs('data_processing.product_data_processor', level='WARNING') as logs:
+            products = self.processor.process_products(raw_products)
+        
+        output = '\n'.join(logs.output)
+        self.assertEqual(products, [])
+        self.assertIn("Skipped product 'No Price': missing a name or price", output)
+        self.assertIn("Skipped product 'Unknown': missing a name or price", output)
+        self.assertIn('2 products failed processing', output)
+    
+    def test_malformed_records_do_not_abort_processing(self):
+        """Test that non-dict records fail individually without stopping the batch."""
+        raw_product = {
+            'name': 'Test Product',
+            'current_price': '$29.99',
+            'product_url': 'https://www.garagegrowngear.com/products/test'
+        }
+        
+        with self.assertLogs('data_processing', level='INFO') as logs:
+            products = self.processor.process_products([None, 'not a record', raw_product])
+        
+        self.assertEqual([product.name for product in products], ['Test Product'])
+        self.assertIn('1/3 products successful', '\n'.join(logs.output))
+    
+    def test_sheets_row_timestamp_keeps_offset(self):
+        """Test that equal timestamps in different zones keep their own offsets."""
+        utc = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        eastern = utc.astimezone(timezone(timedelta(hours=-5)))
+        rows = [
+            Product(timestamp=timestamp, name='Test Product', brand='Test Brand',
+                    current_price=29.99, original_price=None, discount_percentage=None,
+                    availability_status='Available', rating=None, reviews_count=None,
+                    product_url='https://www.garagegrowngear.com/products/test').to_sheets_row()
+            for timestamp in (utc, eastern)
+        ]
+        
+        self.assertEqual(rows[0][0], '2024-01-01T12:00:00+00:00')
+        self.assertEqual(rows[1][0], '2024-01-01T07:00:00-05:00')
+    
+    def test_product_get_only_returns_fields(self):
+        """Test that dict-style get() exposes dataclass fields but not methods or dunders."""
+        product = Product(timestamp=datetime.now(), name='Test Product', brand='Test Brand',
+                          current_price=29.99, original_price=None, discount_percentage=None,
+                          availability_status='Available', rating=None, reviews_count=None,
+                          product_url='https://www.garagegrowngear.com/products/test')
+        
+        self.assertEqual(product.get('name'), 'Test Product')
+        self.assertIsNone(product.get('original_price', 'missing'))
+        self.assertEqual(product.get('to_sheets_row', 'missing'), 'missing')
+        self.assertEqual(product.get('__class__', 'missing'), 'missing')
+        self.assertIsNone(product.get('unknown_field'))
+    
     def test_price_parsing(self):
         """Test price parsing functionality."""
         # Test valid prices
@@ -83,5 +188,101 @@ class TestProductDataProcessor(unittest.TestCase):
         self.assertIsNone(self.processor.price_parser.calculate_discount_percentage(29.99, 0))
 
 
+class TestDataSanitizer(unittest.TestCase):
+    """Test cases for DataSanitizer."""
+    
+    def test_sanitize_integer(self):
+        """Test extraction of the first number from integer fields."""
+        cases = [
+            ('123', 123),
+            (' 12 ', 12),
+            ('(45 reviews)', 45),
+            ('1,234 reviews', 1),
+            ('x12y34', 12),
+            ('٣٤', 34),  # Non-ASCII decimal digits count as digits
+            ('²', None),  # Superscripts do not
+            ('no reviews', None),
+            ('', None),
+            (12.9, 12),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(DataSanitizer.sanitize_integer(value), expected)
+        
+        with self.assertRaises(DataSanitizationError):
+            DataSanitizer.sanitize_integer('200000', min_value=0, max_value=100000)
+    
+    def test_sanitize_string(self):
+        """Test control character removal and whitespace normalization."""
+        self.assertEqual(DataSanitizer.sanitize_string('x\x00y\x1fz\x7f\x9f'), 'xyz')
+        self.assertEqual(DataSanitizer.sanitize_string('  Test   Product \n'), 'Test Product')
+        # Whitespace exposed by removing a control character is collapsed, not trimmed
+        self.assertEqual(DataSanitizer.sanitize_string('\x00 Test'), ' Test')
+        self.assertEqual(DataSanitizer.sanitize_string('abcdef', max_length=3), 'abc')
+        
+        with self.assertRaises(DataSanitizationError):
+            DataSanitizer.sanitize_string(None, allow_empty=False)
+
+
+class TestProductValidator(unittest.TestCase):
+    """Test cases for ProductValidator."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.validator = ProductValidator()
+    
+    def test_missing_required_fields_reported_once(self):
+        """Test that a missing required field yields a single error."""
+        result = self.validator.validate_product({
+            'name': '',
+            'current_price': None,
+            'product_url': 'https://www.garagegrowngear.com/products/test',
+            'brand': 'Test Brand',
+            'availability_status': 'Available',
+        })
+        
+        self.assertFalse(result.is_valid)
+        self.assertEqual([error['field'] for error in result.errors], ['name', 'current_price'])
+    
+    def test_field_errors_for_present_values(self):
+        """Test that present but invalid values are still checked."""
+        result = self.validator.validate_product({
+            'name': 'Test Product',
+            'current_price': 20000,
+            'product_url': 'not a url',
+            'brand': 'Test Brand',
+            'availability_status': 'Available',
+        })
+        
+        self.assertFalse(result.is_valid)
+        self.assertEqual([error['field'] for error in result.errors], ['current_price', 'product_url'])
+        self.assertEqual(result.warnings, [])
+
+    def test_validity_of_record_variants(self):
+        """Test which variants of a valid record pass validation."""
+        valid_product = {
+            'name': 'Test Product',
+            'current_price': 29.99,
+            'product_url': 'https://www.garagegrowngear.com/products/test',
+            'brand': 'Test Brand',
+            'availability_status': 'Available',
+        }
+        cases = [
+            ({}, True),
+            ({'current_price': 0}, False),
+            ({'current_price': 'N/A'}, False),
+            ({'name': '', 'current_price': 20000}, False),
+            ({'product_url': ''}, False),
+            ({'product_url': 'not a url'}, False),
+            # Problems with optional fields are only warnings
+            ({'rating': 9, 'image_url': 'bad host'}, True),
+            ({'name': 'ab', 'original_price': 10}, True),
+        ]
+        for changes, expected in cases:
+            with self.subTest(changes=changes):
+                result = self.validator.validate_product(dict(valid_product, **changes))
+                self.assertEqual(result.is_valid, expected)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Tests for data quality monitoring functionality.
+"""
+
+import unittest
+from data_processing.quality_monitor import DataQualityMonitor
+
+
+class TestDataQualityMonitor(unittest.TestCase):
+    """Test cases for DataQualityMonitor."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.monitor = DataQualityMonitor()
+    
+    def test_analyze_data_quality(self):
+        """Test metric counts for a batch with a mix of issues."""
+        products = [
+            {'name': 'Tent', 'brand': 'Acme', 'current_price': 100.0, 'original_price': 120.0,
+             'discount_percentage': 16.7, 'rating': 4.5, 'availability_status': 'Available',
+             'product_url': 'https://www.garagegrowngear.com/tent'},
+            # Duplicate of the first by normalized brand and name, priced above original
+            {'name': ' tent ', 'brand': 'ACME', 'current_price': 150.0, 'original_price': 120.0,
+             'availability_status': 'Sold out', 'product_url': 'https://example.com/t2'},
+            {'name': '', 'brand': '', 'current_price': None, 'availability_status': '',
+             'product_url': 'not-a-url'},
+            {'name': 'Stove', 'brand': 'Acme', 'current_price': -5.0, 'rating': 7,
+             'discount_percentage': 150, 'availability_status': 'Available',
+             'product_url': 'https://example.com/s'},
+        ]
+        
+        metrics = self.monitor.analyze_data_quality(products)
+        
+        self.assertEqual(metrics.total_products, 4)
+        self.assertEqual(metrics.valid_products, 2)
+        self.assertEqual(metrics.invalid_products, 2)
+        self.assertEqual((metrics.missing_names, metrics.missing_prices, metrics.missing_urls,
+                          metrics.missing_brands, metrics.missing_availability), (1, 1, 0, 1, 1))
+        self.assertEqual((metrics.invalid_prices, metrics.invalid_urls, metrics.invalid_ratings,
+                          metrics.invalid_discounts), (1, 1, 1, 1))
+        self.assertEqual(metrics.price_inconsistencies, 1)
+        self.assertEqual(metrics.duplicate_products, 1)
+        self.assertEqual(metrics.price_range, {'min': 100.0, 'max': 150.0, 'median': 125.0})
+        self.assertEqual(metrics.avg_price, 125.0)
+        self.assertEqual(metrics.availability_distribution, {'Available': 2, 'Sold out': 1, '': 1})
+        self.assertAlmostEqual(metrics.completeness_rate, 80.0)
+        self.assertAlmostEqual(metrics.validity_rate, 50.0)
+        self.assertAlmostEqual(metrics.quality_score, 71.2)
+    
+    def test_quality_report_trends(self):
+        """Test that report trends follow new analyses and are safe to edit."""
+        products = [{'name': 'Tent', 'brand': 'Acme', 'current_price': 100.0,
+                     'availability_status': 'Available',
+                     'product_url': 'https://www.garagegrowngear.com/tent'}]
+        self.monitor.analyze_data_quality(products)
+        self.monitor.analyze_data_quality(products)
+        
+        report = self.monitor.get_quality_report()
+        self.assertEqual(report['quality_trend']['current_score'], 100.0)
+        report['quality_trend']['current_score'] = 0.0
+        self.assertEqual(self.monitor.get_quality_report()['quality_trend']['current_score'], 100.0)
+        
+        self.monitor.analyze_data_quality([dict(products[0], brand='')])
+        report = self.monitor.get_quality_report()
+        self.assertAlmostEqual(report['quality_trend']['current_score'], 92.0)
+        self.assertAlmostEqual(report['historical_trends']['avg_completeness'], 280 / 3)
+    
+    def test_history_size(self):
+        """Test that history is bounded by the size given at construction."""
+        monitor = DataQualityMonitor(max_history_size=2)
+        for price in (10.0, 20.0, 30.0):
+            monitor.analyze_data_quality([{'name': 'Tent', 'current_price': price}])
+        
+        self.assertEqual(monitor.max_history_size, 2)
+        self.assertEqual([m.avg_price for m in monitor.historical_metrics], [20.0, 30.0])
+        with self.assertRaises(AttributeError):
+            monitor.max_history_size = 5
+    
+    def test_calculate_trend(self):
+        """Test trend direction classification."""
+        self.assertEqual(self.monitor._calculate_trend([80.0, 85.0, 90.0, 95.0]), 'improving')
+        self.assertEqual(self.monitor._calculate_trend([95.0, 90.0, 85.0, 80.0]), 'declining')
+        self.assertEqual(self.monitor._calculate_trend([90.0, 90.2, 89.9, 90.1]), 'stable')
+        
+        # A dip that fully recovers is not a trend
+        self.assertEqual(self.monitor._calculate_trend([100.0, 97.2, 92.0, 97.6, 100.0]), 'stable')
+        
+        # Too little history to judge
+        self.assertEqual(self.monitor._calculate_trend([]), 'stable')
+        self.assertEqual(self.monitor._calculate_trend([50.0]), 'stable')
+
+
+if __name__ == '__main__':
+    unittest.main()